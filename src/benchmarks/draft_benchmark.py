@@ -0,0 +1,276 @@
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import player_store  # noqa: E402
+from constants import Constants  # noqa: E402
+from models import Draft, Player  # noqa: E402
+from pick_journal import PickJournal  # noqa: E402
+from player_store import PlayerStore  # noqa: E402
+from synthetic import write_projections  # noqa: E402
+
+SCENARIOS = ["player_load_json", "player_load_bundle", "player_load_snapshot", "cold_start", "warm_start",
+             "draft_init", "select", "print_summary", "simulate_to_next_round", "league_projection", "full_draft"]
+
+# Run in a fresh interpreter to time everything between starting the program and the first board being shown.
+STARTUP_SCRIPT = """
+import sys
+sys.path.insert(0, {source!r})
+from constants import Constants
+Constants.PROJECTED_PLAYER_STATS_FILENAME = {json_filename!r}
+Constants.PLAYER_STORE_BUNDLE = {bundle!r}
+Constants.SNAPSHOT_DIR = {snapshot_dir!r}
+from models import Draft
+from pick_journal import PickJournal
+Draft({drafters}, my_position=-1, journal=PickJournal({journal!r}, {journal_snapshot!r})).print_summary()
+"""
+
+
+class DraftBenchmark:
+    """
+    Times the draft engine against a synthetic pool of `players` players drafted by `drafters` teams over `rounds`
+    rounds. Every file the draft reads or writes lives in `directory`, so the user's own projections and picks are
+    never touched. Each scenario is run `repeat` times and reports every run, per call where it makes many calls.
+    """
+
+    def __init__(self, directory: str, players: int, drafters: int, rounds: int, repeat: int = 3, seed: int = 0):
+        self.directory = directory
+        self.players = players
+        self.drafters = drafters
+        self.rounds = rounds
+        self.repeat = repeat
+        self.json_filename = os.path.join(directory, "projections_" + str(players) + "_" + str(seed) + ".json")
+        self.bundle_path = os.path.join(directory, "projections_" + str(players) + "_" + str(seed) + ".bundle")
+        if not os.path.exists(self.json_filename):
+            write_projections(self.json_filename, players, seed=seed)
+        self.journal_filename = os.path.join(directory, "picks.journal")
+        self.journal_snapshot = os.path.join(directory, "picks.snapshot.json")
+        Constants.PROJECTED_PLAYER_STATS_FILENAME = self.json_filename
+        Constants.PLAYER_STORE_BUNDLE = os.path.join(directory, "missing.bundle")
+        Constants.SNAPSHOT_DIR = os.path.join(directory, "snapshots")
+        self.pool = None
+
+    def run(self, scenarios: list[str]) -> list[dict]:
+        results = []
+        for scenario in scenarios:
+            runs = []
+            for _ in range(self.repeat):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    runs.append(getattr(self, scenario)())
+            results.append({"scenario": scenario, "players": self.players, "drafters": self.drafters,
+                            "rounds": self.rounds, "seconds": statistics.median(runs), "best": min(runs),
+                            "runs": runs})
+        return results
+
+    def new_draft(self) -> Draft:
+        for filename in [self.journal_filename, self.journal_snapshot]:
+            if os.path.exists(filename):
+                os.remove(filename)
+        if self.pool is None:
+            self.pool = Player.load()
+        # No drafter is ours, so a summary never runs the recommendation search, which takes a fixed time budget.
+        return Draft(self.drafters, my_position=-1, players=self.pool.values(),
+                     journal=PickJournal(self.journal_filename, self.journal_snapshot))
+
+    def mid_draft(self) -> Draft:
+        draft = self.new_draft()
+        for _ in range(self.drafters * self.rounds // 2):
+            draft.select_next_best_available()
+        return draft
+
+    def player_load_json(self) -> float:
+        start = time.perf_counter()
+        store = PlayerStore.from_json(self.json_filename)
+        {name: Player(store, idx) for idx, name in enumerate(store.names)}
+        return time.perf_counter() - start
+
+    def player_load_bundle(self) -> float:
+        if not os.path.exists(os.path.join(self.bundle_path, "manifest.json")):
+            PlayerStore.from_json(self.json_filename).save(self.bundle_path)
+        # Time opening the bundle, not fetching the store this process already opened.
+        player_store._forget_bundle(self.bundle_path)
+        start = time.perf_counter()
+        store = PlayerStore.from_bundle(self.bundle_path)
+        {name: Player(store, idx) for idx, name in enumerate(store.names)}
+        return time.perf_counter() - start
+
+    def player_load_snapshot(self) -> float:
+        Player.load()
+        player_store._open_bundles.clear()
+        start = time.perf_counter()
+        Player.load()
+        return time.perf_counter() - start
+
+    def start(self) -> float:
+        script = STARTUP_SCRIPT.format(source=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                       json_filename=self.json_filename, bundle=Constants.PLAYER_STORE_BUNDLE,
+                                       snapshot_dir=Constants.SNAPSHOT_DIR, journal=self.journal_filename,
+                                       journal_snapshot=self.journal_snapshot, drafters=self.drafters)
+        self.new_draft()
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", script], check=True, capture_output=True)
+        return time.perf_counter() - start
+
+    def cold_start(self) -> float:
+        shutil.rmtree(Constants.SNAPSHOT_DIR, ignore_errors=True)
+        return self.start()
+
+    def warm_start(self) -> float:
+        Player.load()
+        return self.start()
+
+    def draft_init(self) -> float:
+        self.new_draft()
+        start = time.perf_counter()
+        self.new_draft()
+        return time.perf_counter() - start
+
+    def select(self) -> float:
+        draft = self.new_draft()
+        names = [player.name for player in draft.available_players[:self.drafters * 2]]
+        start = time.perf_counter()
+        for name in names:
+            draft.select(name)
+        return (time.perf_counter() - start) / len(names)
+
+    def print_summary(self) -> float:
+        draft = self.mid_draft()
+        elapsed = 0.0
+        for _ in range(self.drafters):
+            draft.select_next_best_available()
+            start = time.perf_counter()
+            draft.print_summary()
+            elapsed += time.perf_counter() - start
+        return elapsed / self.drafters
+
+    def simulate_to_next_round(self) -> float:
+        draft = self.mid_draft()
+        start = time.perf_counter()
+        draft.simulate_to_next_round()
+        return time.perf_counter() - start
+
+    def league_projection(self) -> float:
+        draft = self.new_draft()
+        elapsed = 0.0
+        picks = min(self.drafters * self.rounds, len(self.pool))
+        for _ in range(picks):
+            draft.select_next_best_available()
+            start = time.perf_counter()
+            draft.league_projection()
+            elapsed += time.perf_counter() - start
+        return elapsed / picks
+
+    def full_draft(self) -> float:
+        draft = self.new_draft()
+        start = time.perf_counter()
+        for _ in range(min(self.drafters * self.rounds, len(self.pool))):
+            draft.select_next_best_available()
+        return time.perf_counter() - start
+
+
+def scaling_report(results: list[dict]) -> list[str]:
+    """
+    Lays out each scenario's median time against pool size and league size, with the exponent of its growth between
+    consecutive pool sizes: about 1 for an operation linear in the pool, about 0 for one independent of it.
+    """
+    lines = []
+    for scenario in dict.fromkeys(result["scenario"] for result in results):
+        lines.append(scenario)
+        by_league = {}
+        for result in results:
+            if result["scenario"] == scenario:
+                by_league.setdefault((result["drafters"], result["rounds"]), []).append(result)
+        for (drafters, rounds), league_results in by_league.items():
+            previous = None
+            for result in sorted(league_results, key=lambda r: r["players"]):
+                growth = ""
+                if previous is not None and previous["seconds"] > 0 and result["seconds"] > 0:
+                    exponent = (math.log(result["seconds"] / previous["seconds"]) /
+                                math.log(result["players"] / previous["players"]))
+                    growth = "  O(n^" + format(exponent, ".2f") + ")"
+                lines.append("  " + str(drafters).rjust(3) + " teams x " + str(rounds).rjust(2) + " rounds  " +
+                             str(result["players"]).rjust(6) + " players  " +
+                             format(result["seconds"] * 1000, ".3f").rjust(11) + " ms" + growth)
+                previous = result
+    return lines
+
+
+def comparison_report(results: list[dict], baseline: dict, threshold: float) -> list[str]:
+    """
+    Compares the results with those of an earlier run, flagging every scenario that got slower by more than the
+    threshold ratio.
+    """
+    earlier = {(r["scenario"], r["players"], r["drafters"], r["rounds"]): r for r in baseline["results"]}
+    lines = ["Compared with " + str(baseline.get("commit")) + ":"]
+    for result in results:
+        key = (result["scenario"], result["players"], result["drafters"], result["rounds"])
+        if key not in earlier:
+            continue
+        ratio = result["best"] / earlier[key]["best"] if earlier[key]["best"] > 0 else float("inf")
+        flag = "  REGRESSION" if ratio > threshold else ""
+        lines.append("  " + key[0].ljust(24) + str(key[1]).rjust(6) + " players " + str(key[2]).rjust(3) +
+                     " teams  " + format(ratio, ".2f") + "x" + flag)
+    return lines
+
+
+def current_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks the draft engine on seeded synthetic projections.")
+    parser.add_argument("--players", type=int, nargs="+", default=[500, 2000, 10000])
+    parser.add_argument("--drafters", type=int, nargs="+", default=[12, 32])
+    parser.add_argument("--rounds", type=int, nargs="+", default=[16, 25])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--directory", help="where to keep the generated projections, a temporary directory if unset")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", help="results json of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        directory = args.directory or temporary_directory
+        os.makedirs(directory, exist_ok=True)
+        results = []
+        for players in args.players:
+            for drafters in args.drafters:
+                for rounds in args.rounds:
+                    if drafters * rounds > players:
+                        print("Skipping " + str(drafters) + " teams x " + str(rounds) + " rounds with only " +
+                              str(players) + " players")
+                        continue
+                    benchmark = DraftBenchmark(directory, players, drafters, rounds, args.repeat, args.seed)
+                    results.extend(benchmark.run(args.scenarios))
+                    print("Benchmarked " + str(players) + " players, " + str(drafters) + " teams x " + str(rounds) +
+                          " rounds")
+
+    report = {"commit": current_commit(), "python": platform.python_version(), "platform": platform.platform(),
+              "seed": args.seed, "results": results}
+    with open(args.output, 'w') as output_file:
+        json.dump(report, output_file, indent=2)
+    print("\n".join(scaling_report(results)))
+    if args.compare:
+        with open(args.compare, 'r') as baseline_file:
+            print("\n".join(comparison_report(results, json.load(baseline_file), args.threshold)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "services"))
+from data_crawler import DataCrawler  # noqa: E402
+from fixture_server import FixtureServer  # noqa: E402
+from synthetic import write_season_pages  # noqa: E402
+
+
+def peak_memory_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingests synthetic seasons of box scores from a local fixture "
+                                                 "server, season by season, and then again to check nothing is "
+                                                 "fetched twice.")
+    parser.add_argument("--seasons", type=int, default=3)
+    parser.add_argument("--players", type=int, default=1500)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--fetchers", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--parser", default="streaming")
+    parser.add_argument("--directory", help="where to keep the pages and the ingested stats, a temporary directory "
+                                            "if unset")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        directory = args.directory or temporary_directory
+        seasons = list(range(2024 - args.seasons, 2024))
+        pages_dir = os.path.join(directory, "pages")
+        games = {season: write_season_pages(pages_dir, season, args.players, seed=season) for season in seasons}
+        fixtures = FixtureServer(pages_dir).start()
+        crawler = DataCrawler()
+        crawler.ROOT_URL = fixtures.url
+        crawler.ROOT = fixtures.url + "/years/{season}/games.htm"
+        options = {"workers": args.workers, "fetchers": args.fetchers, "batch_size": args.batch_size,
+                   "parser": args.parser}
+        try:
+            for season in seasons:
+                start = time.perf_counter()
+                store = crawler.crawl_historical_stats([season], directory, **options)[str(season)]
+                elapsed = time.perf_counter() - start
+                print(str(season) + ": " + str(games[season]) + " games, " + str(len(store)) + " players, " +
+                      format(games[season] / elapsed, ".1f") + " games/second, peak memory " +
+                      format(peak_memory_mb(), ".0f") + " MB")
+
+            served = fixtures.requests_served
+            start = time.perf_counter()
+            crawler.crawl_historical_stats(seasons, directory, **options)
+            print("Re-ran " + str(len(seasons)) + " seasons in " + format(time.perf_counter() - start, ".2f") +
+                  "s fetching " + str(fixtures.requests_served - served) + " pages")
+        finally:
+            fixtures.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from draft_benchmark import current_commit  # noqa: E402
+from synthetic import write_projections  # noqa: E402
+
+# Runs the service in its own interpreter, so the client's work is not counted against it.
+SERVICE_SCRIPT = """
+import asyncio, sys
+sys.path.insert(0, {source!r})
+from constants import Constants
+Constants.PROJECTED_PLAYER_STATS_FILENAME = {json_filename!r}
+Constants.PLAYER_STORE_BUNDLE = {bundle!r}
+Constants.SNAPSHOT_DIR = {snapshot_dir!r}
+from draft_service import DraftService, serve
+from models import Player
+asyncio.run(serve(DraftService(Player.load(), {sessions_dir!r}), "127.0.0.1", 0, {unix_path!r}))
+"""
+
+
+class ServiceClient:
+    """
+    A keep-alive json client for one connection to the draft service, recording how long each request took by
+    route.
+    """
+
+    def __init__(self, host: str = None, port: int = None, unix_path: str = None):
+        self.host = host
+        self.port = port
+        self.unix_path = unix_path
+        self.reader = None
+        self.writer = None
+        self.latencies = {}
+
+    async def connect(self) -> None:
+        if self.unix_path is not None:
+            self.reader, self.writer = await asyncio.open_unix_connection(self.unix_path)
+        else:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def close(self) -> None:
+        self.writer.close()
+        await self.writer.wait_closed()
+
+    async def request(self, method: str, path: str, route: str, payload: dict = None) -> tuple[int, dict]:
+        body = json.dumps(payload).encode() if payload is not None else b""
+        start = time.perf_counter()
+        self.writer.write((method + " " + path + " HTTP/1.1\r\nHost: localhost\r\n" +
+                           "Content-Type: application/json\r\nContent-Length: " + str(len(body)) +
+                           "\r\n\r\n").encode() + body)
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        response = json.loads(await self.reader.readexactly(int(headers["content-length"])))
+        self.latencies.setdefault(method + " " + route, []).append(time.perf_counter() - start)
+        return status, response
+
+
+async def draft_session(client: ServiceClient, session_id: str, drafters: int, rounds: int, undo_every: int) -> int:
+    """
+    Drafts a whole league the way a user would, looking at the board before every pick and taking its best
+    available player, undoing and redoing a pick every `undo_every` picks. Returns the number of picks made.
+    """
+    await client.connect()
+    status, state = await client.request("POST", "/drafts", "/drafts",
+                                          {"session": session_id, "drafters": drafters, "my_position": -1})
+    if status != 201:
+        raise RuntimeError("Could not open session " + session_id + ": " + str(state))
+    path = "/drafts/" + session_id
+    picks = 0
+    for pick in range(1, drafters * rounds + 1):
+        _, board = await client.request("GET", path + "/board", "/drafts/<session>/board")
+        best = board["available"][-1][0]["name"]
+        await client.request("GET", path + "/players?q=" + best[:3], "/drafts/<session>/players")
+        status, state = await client.request("POST", path + "/picks", "/drafts/<session>/picks", {"player": best})
+        if status != 200:
+            raise RuntimeError("Pick " + str(pick) + " of " + session_id + " failed: " + str(state))
+        picks += 1
+        if undo_every and pick % undo_every == 0:
+            await client.request("POST", path + "/undo", "/drafts/<session>/undo")
+            await client.request("POST", path + "/picks", "/drafts/<session>/picks", {"player": best})
+    await client.request("DELETE", path, "/drafts/<session>")
+    await client.close()
+    return picks
+
+
+def percentile(values: list[float], share: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(share * len(ordered)))]
+
+
+async def run_load(clients: list[ServiceClient], drafters: int, rounds: int, undo_every: int) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*[draft_session(client, "load-" + str(number), drafters, rounds, undo_every)
+                           for number, client in enumerate(clients)])
+    return time.perf_counter() - start
+
+
+def latency_report(clients: list[ServiceClient], elapsed: float) -> tuple[list[dict], list[str]]:
+    by_route = {}
+    for client in clients:
+        for route, latencies in client.latencies.items():
+            by_route.setdefault(route, []).extend(latencies)
+    results = [{"route": route, "requests": len(latencies), "p50": percentile(latencies, 0.5),
+                "p95": percentile(latencies, 0.95), "p99": percentile(latencies, 0.99), "max": max(latencies)}
+               for route, latencies in by_route.items()]
+    requests = sum(result["requests"] for result in results)
+    lines = [str(len(clients)) + " concurrent drafts made " + str(requests) + " requests in " +
+             format(elapsed, ".2f") + "s, " + format(requests / elapsed if elapsed else 0.0, ".0f") + " requests/second"]
+    for result in results:
+        lines.append("  " + result["route"].ljust(32) + str(result["requests"]).rjust(7) + " requests  p50 " +
+                     format(result["p50"] * 1000, ".2f").rjust(8) + "ms  p95 " +
+                     format(result["p95"] * 1000, ".2f").rjust(8) + "ms  p99 " +
+                     format(result["p99"] * 1000, ".2f").rjust(8) + "ms  max " +
+                     format(result["max"] * 1000, ".2f").rjust(8) + "ms")
+    return results, lines
+
+
+def start_service(directory: str, players: int, seed: int, unix: bool):
+    """
+    Starts the service on a synthetic pool in a child process and returns the process with the address it serves.
+    """
+    json_filename = os.path.join(directory, "projections_" + str(players) + "_" + str(seed) + ".json")
+    if not os.path.exists(json_filename):
+        write_projections(json_filename, players, seed=seed)
+    unix_path = os.path.join(directory, "drafts.sock") if unix else None
+    script = SERVICE_SCRIPT.format(source=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                   json_filename=json_filename, bundle=os.path.join(directory, "missing.bundle"),
+                                   snapshot_dir=os.path.join(directory, "snapshots"),
+                                   sessions_dir=os.path.join(directory, "sessions"), unix_path=unix_path)
+    process = subprocess.Popen([sys.executable, "-c", script], stdout=subprocess.PIPE, text=True)
+    address = process.stdout.readline().strip().split(" ")[-1]
+    if not address:
+        process.kill()
+        raise RuntimeError("The draft service did not start")
+    return process, address
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drafts many leagues at once against the draft service.")
+    parser.add_argument("--sessions", type=int, default=24, help="concurrent drafts")
+    parser.add_argument("--drafters", type=int, default=12)
+    parser.add_argument("--rounds", type=int, default=16)
+    parser.add_argument("--undo-every", type=int, default=25, help="undo and redo every this many picks, 0 never")
+    parser.add_argument("--url", help="a running service, http://host:port, otherwise one is started")
+    parser.add_argument("--unix", help="a running service's Unix socket, or 'start' to start one on a socket")
+    parser.add_argument("--players", type=int, default=2000, help="synthetic pool size of a started service")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="service_load_results.json")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        process = None
+        address = args.url or args.unix
+        if address is None or address == "start":
+            process, address = start_service(directory, args.players, args.seed, args.unix == "start")
+        try:
+            if address.startswith("http://"):
+                host, port = address[len("http://"):].rstrip("/").split(":")
+                clients = [ServiceClient(host, int(port)) for _ in range(args.sessions)]
+            else:
+                clients = [ServiceClient(unix_path=address) for _ in range(args.sessions)]
+            elapsed = asyncio.run(run_load(clients, args.drafters, args.rounds, args.undo_every))
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait()
+
+    results, lines = latency_report(clients, elapsed)
+    report = {"commit": current_commit(), "python": platform.python_version(), "platform": platform.platform(),
+              "sessions": args.sessions, "drafters": args.drafters, "rounds": args.rounds,
+              "players": args.players if process is not None else None, "seconds": elapsed, "results": results}
+    with open(args.output, 'w') as output_file:
+        json.dump(report, output_file, indent=2)
+    print("\n".join(lines))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+import argparse
+import html
+import json
+import os
+
+import numpy as np
+
+TEAMS = ["ARI", "ATL", "BAL", "BUF", "CAR", "CHI", "CIN", "CLE", "DAL", "DEN", "DET", "GB", "HOU", "IND", "JAX", "KC",
+         "LAC", "LAR", "LV", "MIA", "MIN", "NE", "NO", "NYG", "NYJ", "PHI", "PIT", "SEA", "SF", "TB", "TEN", "WAS"]
+
+# Share of the pool at each position and the mean weekly projection of a starter quality player, in the order the
+# projection site lists the stats: passing yards and touchdowns, interceptions, rushing yards and touchdowns,
+# receiving yards and touchdowns and fumbles.
+POSITIONS = {"QB": (0.15, [260.0, 1.8, 0.8, 18.0, 0.15, 0.0, 0.0, 0.2]),
+             "RB": (0.30, [0.0, 0.0, 0.0, 70.0, 0.55, 25.0, 0.15, 0.15]),
+             "WR": (0.40, [0.0, 0.0, 0.0, 4.0, 0.02, 70.0, 0.45, 0.08]),
+             "TE": (0.15, [0.0, 0.0, 0.0, 0.0, 0.0, 45.0, 0.3, 0.05])}
+STAT_KEYS = ["passing_yards", "passing_tds", "interceptions", "rushing_yards", "rushing_tds", "receiving_yards",
+             "receiving_tds", "fumbles"]
+# The stat_<n> column of each stat on the projection site.
+PROJECTION_COLUMNS = [("passing_yards", 5), ("passing_tds", 6), ("interceptions", 7), ("rushing_yards", 14),
+                      ("rushing_tds", 15), ("receptions", 20), ("receiving_yards", 21), ("receiving_tds", 22),
+                      ("fumbles", 30)]
+
+
+def generate_projections(players: int, weeks: int = 18, seed: int = 0) -> dict:
+    """
+    Generates weekly projections in the format the crawler saves them, for a pool of the given size. Players are
+    spread over positions and teams like the real pool, their quality falls off exponentially like real projections
+    do, every team has a bye week in which none of its players are projected and a few players are left out of
+    random weeks as injured. The same players, weeks and seed always generate the same projections.
+    """
+    rng = np.random.default_rng(seed)
+    names = ["Synthetic Player " + str(number).zfill(len(str(players))) for number in range(1, players + 1)]
+    positions = rng.choice(list(POSITIONS), size=players, p=[share for share, _ in POSITIONS.values()])
+    teams = rng.choice(TEAMS, size=players)
+    byes = dict(zip(TEAMS, rng.integers(5, 15, size=len(TEAMS)) if weeks >= 15 else [weeks + 1] * len(TEAMS)))
+    quality = np.minimum(rng.exponential(0.45, size=players), 1.6)
+    means = np.array([POSITIONS[position][1] for position in positions]) * quality[:, None]
+
+    projections = {}
+    for week in range(1, weeks + 1):
+        stats = rng.gamma(8.0, means / 8.0)
+        projected = (rng.random(players) > 0.03) & np.array([byes[team] != week for team in teams])
+        rows = []
+        for idx in np.flatnonzero(projected):
+            rows.append({"player_name": names[idx],
+                         **{key: format(value, ".1f") if value >= 0.05 else "-"
+                            for key, value in zip(STAT_KEYS, stats[idx])},
+                         "player_position": str(positions[idx]), "player_team": str(teams[idx])})
+        projections[str(week)] = rows
+    return projections
+
+
+def write_projections(filename: str, players: int, weeks: int = 18, seed: int = 0) -> None:
+    with open(filename, 'w') as projections_file:
+        json.dump(generate_projections(players, weeks, seed), projections_file)
+
+
+def render_projection_page(rows: list[dict]) -> str:
+    """
+    Renders one week of projections as the projection site's page. A stat the rows do not have, like receptions in
+    older projections, gets no column, and a player without a team gets no " - TEAM" after their position.
+    """
+    page = ['<html><head><title>Projections</title></head><body><table class="tableType-player"><thead><tr>'
+            '<th>Player</th></tr></thead><tbody>']
+    for number, row in enumerate(rows):
+        team = "" if row["player_team"] == "N/A" else " - " + row["player_team"]
+        page.append('<tr class="player-' + str(number) + ' odd"><td class="playerNameAndInfo first"><div class="c">' +
+                    '<a href="/players/card?id=' + str(number) + '" class="playerCard playerName playerNameFull">' +
+                    html.escape(row["player_name"]) + '</a> <em>' + row["player_position"] + team + '</em> ' +
+                    '<a class="playerNote">note &amp; news</a></div></td><td class="playerOpponent">@KC</td>')
+        for key, stat in PROJECTION_COLUMNS:
+            if key in row:
+                page.append('<td class="stat stat_' + str(stat) + ' numeric">' + row[key] + '</td>')
+        page.append('<td class="stat projected numeric last"><span class="playerWeekProjectedPts">9.1</span></td>'
+                    '</tr>\n')
+    page.append('</tbody></table></body></html>')
+    return "".join(page)
+
+
+def write_projection_pages(directory: str, players: int, weeks: int = 18, seed: int = 0) -> None:
+    """
+    Writes the projection site's week_<n>.html page for every week of the synthetic projections, the layout
+    FixtureServer serves projection requests from.
+    """
+    os.makedirs(directory, exist_ok=True)
+    for week, rows in generate_projections(players, weeks, seed).items():
+        with open(os.path.join(directory, "week_" + week + ".html"), 'w') as page_file:
+            page_file.write(render_projection_page(rows))
+
+
+def write_season_pages(directory: str, season: int, players: int = 1500, weeks: int = 18, seed: int = 0) -> int:
+    """
+    Writes a season of box score pages, and the schedule page linking them, laid out the way the box score site
+    serves them: the schedule at years/<season>/games.htm and each game at boxscores/<game>.htm. Each week's teams
+    are paired into games and every player projected that week gets a box score row of their rounded projection.
+    Returns the number of games.
+    """
+    rng = np.random.default_rng(seed)
+    projections = generate_projections(players, weeks, seed)
+    os.makedirs(os.path.join(directory, "boxscores"), exist_ok=True)
+    os.makedirs(os.path.join(directory, "years", str(season)), exist_ok=True)
+    schedule = ['<html><body><table id="games"><tbody>']
+    games = 0
+    for week, rows in projections.items():
+        by_team = {}
+        for row in rows:
+            by_team.setdefault(row["player_team"], []).append(row)
+        teams = list(rng.permutation(TEAMS))
+        for game in range(len(teams) // 2):
+            link = "/boxscores/" + str(season) + week.zfill(2) + str(game).zfill(2) + ".htm"
+            page = ['<html><body><div id="all_player_offense"><table class="stats_table" id="player_offense"><tbody>']
+            for row in by_team.get(teams[2 * game], []) + by_team.get(teams[2 * game + 1], []):
+                stats = {key: int(round(float(row[key]))) if row[key] != "-" else 0 for key in STAT_KEYS}
+                page.append('<tr><th data-stat="player" data-append-csv="' + html.escape(row["player_name"]) + '">' +
+                            '<a href="/players/x.htm">' + html.escape(row["player_name"]) + '</a></th>' +
+                            '<td data-stat="team">' + row["player_team"] + '</td>' +
+                            ''.join('<td data-stat="' + stat + '">' + str(value) + '</td>' for stat, value in [
+                                ("pass_yds", stats["passing_yards"]), ("pass_td", stats["passing_tds"]),
+                                ("pass_int", stats["interceptions"]), ("rush_yds", stats["rushing_yards"]),
+                                ("rush_td", stats["rushing_tds"]), ("rec", stats["receiving_yards"] // 11),
+                                ("rec_yds", stats["receiving_yards"]), ("rec_td", stats["receiving_tds"]),
+                                ("fumbles_lost", stats["fumbles"])]) + '</tr>\n')
+            page.append('</tbody></table></div></body></html>')
+            with open(os.path.join(directory, link.lstrip("/")), 'w') as page_file:
+                page_file.write("".join(page))
+            schedule.append('<tr><th data-stat="week_num">' + week + '</th><td data-stat="boxscore_word">' +
+                            '<a href="' + link + '">boxscore</a></td></tr>')
+            games += 1
+    schedule.append('</tbody></table></body></html>')
+    with open(os.path.join(directory, "years", str(season), "games.htm"), 'w') as schedule_file:
+        schedule_file.write("".join(schedule))
+    return games
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Writes seeded synthetic weekly projections, or their pages, for "
+                                                 "benchmarking.")
+    parser.add_argument("filename")
+    parser.add_argument("--players", type=int, default=1000)
+    parser.add_argument("--weeks", type=int, default=18)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--pages", action="store_true",
+                        help="write the filename as a directory of projection pages and a season of box score pages")
+    args = parser.parse_args()
+    if args.pages:
+        write_projection_pages(args.filename, args.players, args.weeks, args.seed)
+        write_season_pages(args.filename, 2023, args.players, args.weeks, args.seed)
+    else:
+        write_projections(args.filename, args.players, args.weeks, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,8 +4,8 @@ from constants import Constants
 
 def clean():
     for f in [
-        Constants.ROSTERS_PICKLE_FILENAME,
-        Constants.PLAYER_PICKLE_FILENAME
+        Constants.PICK_JOURNAL_FILENAME,
+        Constants.PICK_SNAPSHOT_FILENAME
     ]:
         try:
             os.remove(f)
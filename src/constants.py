@@ -4,8 +4,12 @@ import os
 class Constants:
     _current_dir = os.path.dirname(__file__)
     RESOURCES_DIR = os.path.join(_current_dir, 'resources')
-    PLAYER_PICKLE_FILENAME = os.path.join(RESOURCES_DIR, 'players.pickle')
     ROSTER_PICKLE_FILENAME = os.path.join(RESOURCES_DIR, 'roster.pickle')
-    ROSTERS_PICKLE_FILENAME = os.path.join(RESOURCES_DIR, 'rosters.pickle')
+    PICK_JOURNAL_FILENAME = os.path.join(RESOURCES_DIR, 'picks.journal')
+    PICK_SNAPSHOT_FILENAME = os.path.join(RESOURCES_DIR, 'picks.snapshot.json')
     PROJECTED_PLAYER_STATS_FILENAME = os.path.join(RESOURCES_DIR, 'projected_player_stats.json')
+    PLAYER_STORE_BUNDLE = os.path.join(RESOURCES_DIR, 'projected_player_stats.bundle')
+    SNAPSHOT_DIR = os.path.join(RESOURCES_DIR, 'snapshots')
+    SESSIONS_DIR = os.path.join(RESOURCES_DIR, 'sessions')
     KEEPERS_FILENAME = os.path.join(RESOURCES_DIR, 'keepers.json')
+    SCORING_RULES_FILENAME = os.path.join(RESOURCES_DIR, 'scoring_rules.json')
@@ -0,0 +1,23 @@
+import argparse
+
+from constants import Constants
+from player_store import PlayerStore
+
+
+def convert(to_json: bool = False):
+    if to_json:
+        PlayerStore.from_bundle(Constants.PLAYER_STORE_BUNDLE).to_json(Constants.PROJECTED_PLAYER_STATS_FILENAME)
+    else:
+        PlayerStore.from_json(Constants.PROJECTED_PLAYER_STATS_FILENAME).save(Constants.PLAYER_STORE_BUNDLE)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Converts the projected player stats between json and the binary "
+                                                 "bundle that Player.load memory-maps.")
+    parser.add_argument("--to-json", action="store_true", help="export the bundle back to json")
+    args = parser.parse_args()
+    convert(args.to_json)
+
+
+if __name__ == "__main__":
+    main()
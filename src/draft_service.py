@@ -0,0 +1,282 @@
+import argparse
+import asyncio
+import functools
+import json
+import os
+import re
+import sys
+import traceback
+import uuid
+from urllib.parse import parse_qs, urlparse
+
+from constants import Constants
+from models import Draft, Player
+from name_index import NameIndex
+from pick_journal import PickJournal
+from scoring import ScoringConfig
+
+
+class RequestError(Exception):
+    """
+    A request the service cannot serve, answered with the given HTTP status and the message as its error.
+    """
+
+    def __init__(self, status: int, message: str, **details):
+        super().__init__(message)
+        self.status = status
+        self.details = details
+
+
+class DraftSession:
+    """
+    One hosted draft. Its picks are journaled under its own directory of the sessions directory, beside the league
+    settings it was opened with, so it is resumed as it was left when it is opened again, even after a restart.
+
+    A draft is not safe to use from two threads at once, so every request to a session holds its lock, while
+    requests to different sessions run side by side.
+    """
+
+    def __init__(self, session_id: str, directory: str, players: list[Player], drafters: int, my_position: int):
+        self.session_id = session_id
+        self.directory = directory
+        self.drafters = drafters
+        self.my_position = my_position
+        os.makedirs(directory, exist_ok=True)
+        journal = PickJournal(os.path.join(directory, "picks.journal"), os.path.join(directory, "picks.snapshot.json"))
+        self.draft = Draft(drafters, my_position, players=players, journal=journal)
+        # The settings are only recorded once the journal has replayed under them.
+        with open(os.path.join(directory, "session.json"), 'w') as session_file:
+            json.dump({"drafters": drafters, "my_position": my_position}, session_file)
+        self.lock = asyncio.Lock()
+
+    def state(self) -> dict:
+        draft = self.draft
+        return {"session": self.session_id, "drafters": self.drafters, "my_position": self.my_position,
+                "pick": len(draft.pick_log) + 1, "round": len(draft.pick_log) // self.drafters + 1,
+                "current_position": draft.current_position,
+                "last_pick": ({"slot": draft.pick_log[-1][0], "name": draft.pick_log[-1][1].name}
+                              if draft.pick_log else None)}
+
+    def board(self) -> dict:
+        return {**self.state(), **self.draft.current_board().as_dict()}
+
+    def standings(self) -> dict:
+        return {**self.state(), "standings": self.draft.league_projection().standings()}
+
+    def select(self, player_name: str) -> dict:
+        player, suggestions = self.draft.resolve(player_name)
+        if player is None:
+            raise RequestError(404, "Could not find player " + player_name,
+                               suggestions=[suggestion.name for suggestion in suggestions])
+        self.draft.select_player(player)
+        self.draft.save()
+        return self.state()
+
+    def unselect(self) -> dict:
+        if not self.draft.pick_log:
+            raise RequestError(409, "There are no picks to undo.")
+        self.draft.unselect_player()
+        self.draft.save()
+        return self.state()
+
+    def complete(self, prefix: str, limit: int) -> dict:
+        return {"players": [{"name": player.name, "position": player.position, "team": player.team}
+                            for player in self.draft.pool.complete(prefix, limit)]}
+
+
+class DraftService:
+    """
+    Hosts many drafts at once over HTTP, on a TCP port or a Unix socket. Every session drafts from the same player
+    store, loaded and scored once and frozen read-only, so a new session costs only its own pool and rosters and no
+    session can change the projections another one sees.
+
+    The routes take and return json:
+
+        GET    /drafts                       the open sessions
+        POST   /drafts                       open a session, {"session", "drafters", "my_position"} all optional
+        GET    /drafts/<session>             whose pick it is
+        DELETE /drafts/<session>             close the session, its journal is kept
+        GET    /drafts/<session>/board       the roster and available players table of the current pick
+        GET    /drafts/<session>/standings   every roster's projected best-ball season and the standings
+        POST   /drafts/<session>/picks       pick {"player": name}, answered 404 with suggestions if not found
+        POST   /drafts/<session>/undo        undo the last pick
+        GET    /drafts/<session>/players?q=  complete a player name
+    """
+
+    SESSION_ID = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
+    def __init__(self, players: dict[str, Player], sessions_dir: str):
+        self.players = list(players.values())
+        if self.players:
+            # Every session looks names up in the one index of the shared store.
+            NameIndex.of(self.players[0].store)
+            self.players[0].store.freeze()
+        self.sessions_dir = sessions_dir
+        self.sessions = {}
+        self.requests_served = 0
+
+    def session_directory(self, session_id: str) -> str:
+        if not self.SESSION_ID.fullmatch(session_id):
+            raise RequestError(400, "Session ids are 1 to 64 letters, digits, dashes or underscores")
+        return os.path.join(self.sessions_dir, session_id)
+
+    async def open_session(self, settings: dict) -> DraftSession:
+        session_id = str(settings.get("session") or uuid.uuid4().hex[:12])
+        directory = self.session_directory(session_id)
+        if session_id in self.sessions:
+            return self.sessions[session_id]
+        try:
+            drafters = int(settings.get("drafters", 12))
+            my_position = int(settings.get("my_position", -1))
+        except (TypeError, ValueError):
+            raise RequestError(400, "drafters and my_position must be integers")
+        try:
+            with open(os.path.join(directory, "session.json"), 'r') as session_file:
+                stored = json.load(session_file)
+        except FileNotFoundError:
+            stored = None
+        if stored is not None:
+            # An existing session keeps the league it was opened with, its journal only replays under those settings.
+            for key, value in [("drafters", drafters), ("my_position", my_position)]:
+                if key in settings and value != stored[key]:
+                    raise RequestError(409, "Session " + session_id + " was opened with " + key + " " +
+                                       str(stored[key]))
+            drafters, my_position = stored["drafters"], stored["my_position"]
+        if drafters < 1:
+            raise RequestError(400, "A draft needs at least one drafter")
+        # Replaying a long journal is real work, keep it off the event loop.
+        session = await asyncio.to_thread(DraftSession, session_id, directory, self.players, drafters, my_position)
+        return self.sessions.setdefault(session_id, session)
+
+    async def session(self, session_id: str) -> DraftSession:
+        if session_id not in self.sessions:
+            if not os.path.exists(os.path.join(self.session_directory(session_id), "session.json")):
+                raise RequestError(404, "No draft session " + session_id)
+            await self.open_session({"session": session_id})
+        return self.sessions[session_id]
+
+    async def dispatch(self, method: str, target: str, body: bytes) -> tuple[int, object]:
+        url = urlparse(target)
+        route = [part for part in url.path.split("/") if part]
+        try:
+            payload = json.loads(body) if body else {}
+        except ValueError:
+            raise RequestError(400, "The request body is not json")
+        if not isinstance(payload, dict):
+            raise RequestError(400, "The request body must be a json object")
+
+        if route == ["drafts"]:
+            if method == "GET":
+                return 200, {"sessions": [session.state() for session in self.sessions.values()]}
+            if method == "POST":
+                session = await self.open_session(payload)
+                return 201, session.state()
+        elif len(route) in (2, 3) and route[0] == "drafts":
+            session = await self.session(route[1])
+            action = route[2] if len(route) == 3 else None
+            if action is None and method == "DELETE":
+                async with session.lock:
+                    self.sessions.pop(session.session_id, None)
+                return 200, session.state()
+            handler = {(None, "GET"): session.state, ("board", "GET"): session.board,
+                       ("standings", "GET"): session.standings,
+                       ("undo", "POST"): session.unselect}.get((action, method))
+            if action == "picks" and method == "POST":
+                if not isinstance(payload.get("player"), str):
+                    raise RequestError(400, "A pick needs the player's name")
+                handler = functools.partial(session.select, payload["player"])
+            elif action == "players" and method == "GET":
+                query = parse_qs(url.query)
+                limit = query.get("limit", ["10"])[0]
+                if not limit.isdigit():
+                    raise RequestError(400, "limit must be a number")
+                handler = functools.partial(session.complete, query.get("q", [""])[0], int(limit))
+            if handler is not None:
+                # Picks fsync the journal and boards score the whole pool, so both run on a worker thread and
+                # leave the event loop free for the other sessions.
+                async with session.lock:
+                    return 200, await asyncio.to_thread(handler)
+        raise RequestError(404 if method in ("GET", "POST", "DELETE") else 405, "No route " + method + " " + url.path)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Serves the requests of one connection, keeping it open between requests unless the client asks to close it.
+        """
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, version = request_line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                try:
+                    status, response = await self.dispatch(method, target, body)
+                except RequestError as error:
+                    status, response = error.status, {"error": str(error), **error.details}
+                except Exception as error:
+                    print("Failed to serve " + method + " " + target + ":", file=sys.stderr)
+                    traceback.print_exc()
+                    status, response = 500, {"error": type(error).__name__ + ": " + str(error)}
+                self.requests_served += 1
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                data = json.dumps(response).encode()
+                writer.write(("HTTP/1.1 " + str(status) + " " + STATUS_REASONS.get(status, "") + "\r\n" +
+                              "Content-Type: application/json\r\n" + "Content-Length: " + str(len(data)) + "\r\n" +
+                              "Connection: " + ("keep-alive" if keep_alive else "close") + "\r\n\r\n").encode() + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            # The client hung up or sent something that is not HTTP, there is no one to answer.
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765, unix_path: str = None) -> asyncio.Server:
+        if unix_path is not None:
+            return await asyncio.start_unix_server(self.handle, path=unix_path)
+        return await asyncio.start_server(self.handle, host, port)
+
+
+STATUS_REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                  409: "Conflict", 500: "Internal Server Error"}
+
+
+async def serve(service: DraftService, host: str, port: int, unix_path: str = None) -> None:
+    server = await service.start(host, port, unix_path)
+    async with server:
+        if unix_path is not None:
+            print("Serving drafts on " + unix_path, flush=True)
+        else:
+            host, port = server.sockets[0].getsockname()[:2]
+            print("Serving drafts on http://" + host + ":" + str(port), flush=True)
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hosts many drafts at once over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765, help="0 picks a free port")
+    parser.add_argument("--unix", help="serve on this Unix socket instead of a TCP port")
+    parser.add_argument("--sessions-dir", default=Constants.SESSIONS_DIR)
+    parser.add_argument("--scoring", help="name of the scoring rules to draft with, the file's default if unset")
+    args = parser.parse_args()
+
+    scoring_rules = ScoringConfig.load(Constants.SCORING_RULES_FILENAME).get(args.scoring)
+    service = DraftService(Player.load(scoring_rules), args.sessions_dir)
+    try:
+        asyncio.run(serve(service, args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
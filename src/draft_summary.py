@@ -0,0 +1,101 @@
+import numpy as np
+
+from instrumentation import instrumented
+
+
+class BoardSnapshot:
+    """
+    The available players table for one pick of a draft. Every available player is scored against the current roster
+    exactly once, in a single vectorized pass, and each position group's top players are then found by partial
+    selection over those scores rather than by sorting the whole pool. The table is rendered from the snapshot's
+    arrays, so a summary printed again for the same pick is not recomputed.
+    """
+
+    GROUPS = [["QB"], ["RB"], ["WR", "TE"], None]
+
+    @instrumented
+    def __init__(self, draft, top_count: int = 7):
+        self.key = draft.board_key()
+        self.top_count = top_count
+        self.mine = draft.current_position == draft.my_position
+        self.roster = [[player.name, index + 1, player.position, player.team]
+                       for index, player in enumerate(draft.current_roster().all_players)]
+
+        store = draft.pool.store
+        future_picks = draft.simulate_to_next_round()
+        self.indices = np.flatnonzero(draft.pool.available)
+        self.net = draft.current_roster().net_additional_scores_at(store, self.indices)
+        self.overall = store.totals[self.indices]
+        positions = store.positions[self.indices]
+        taken = np.isin(self.indices, [player.index for player in future_picks])
+
+        self.rows = []
+        for group in self.GROUPS:
+            in_group = np.ones(len(self.indices), dtype=bool) if group is None else np.isin(positions, group)
+            top = self.top(in_group)
+            next_best = self.top(in_group & ~taken, 1)
+            next_best_overall = self.overall[next_best[0]] if len(next_best) else None
+            for rank, row in enumerate(top):
+                index = self.indices[row]
+                against_next_best = "-" if next_best_overall is None else self.overall[row] - next_best_overall
+                self.rows.append(([store.names[index], store.positions[index], self.net[row], self.overall[row],
+                                   against_next_best, store.teams[index]], rank == len(top) - 1))
+        self.recommendation = None
+
+    def top(self, rows: np.ndarray, count: int = None) -> np.ndarray:
+        """
+        Returns the positions in the snapshot of the best `count` selected players by net additional score, then
+        overall score, then store order, which is the order the player pool ranks them in.
+        """
+        count = self.top_count if count is None else count
+        rows = np.flatnonzero(rows)
+        if len(rows) > count:
+            # Keep every player tied with the count-th best net score so the tie breaks below still apply.
+            kth = np.partition(-self.net[rows], count - 1)[count - 1]
+            rows = rows[-self.net[rows] <= kth]
+        order = np.lexsort((self.indices[rows], -self.overall[rows], -self.net[rows]))
+        return rows[order[:count]]
+
+    def as_dict(self) -> dict:
+        """
+        The snapshot as plain json values, the available players split into their position groups.
+        """
+        groups = [[]]
+        for row, divider in self.rows:
+            name, position, net, overall, against_next_best, team = [
+                value.item() if isinstance(value, np.generic) else value for value in row]
+            groups[-1].append({"name": name, "position": position, "net_additional_score": net,
+                               "overall_score": overall, "points_against_next_best": against_next_best,
+                               "team": team})
+            if divider:
+                groups.append([])
+        return {"roster": [{"name": name, "position_drafted": drafted, "position": position, "team": team}
+                           for name, drafted, position, team in self.roster],
+                "available": [group for group in groups if group]}
+
+    @instrumented
+    def print(self) -> None:
+        from prettytable.colortable import ColorTable, Themes
+        from prettytable import PrettyTable
+
+        available_table = PrettyTable()
+        roster_table = PrettyTable()
+        if self.mine:
+            roster_table = ColorTable(theme=Themes.OCEAN)
+            available_table = ColorTable(theme=Themes.OCEAN)
+
+        available_table.field_names = ["Name", "Position", "Net Additional Score", "Overall Score",
+                                       "Points Against Next Best", "Team"]
+        available_table.float_format = ".2"
+        roster_table.field_names = ["Name", "Position Drafted", "Position", "Team"]
+
+        for row in self.roster:
+            roster_table.add_row(row)
+        for row, divider in self.rows:
+            available_table.add_row([value.item() if isinstance(value, np.generic) else value for value in row],
+                                    divider=divider)
+        print("Roster:")
+        print(roster_table)
+        print("")
+        print("Available Players:")
+        print(available_table)
@@ -0,0 +1,143 @@
+import cProfile
+import functools
+import inspect
+import json
+import os
+import sys
+import time
+
+# Every function marked as a hot path, as (module name, qualified name) pairs. Marking a function leaves it exactly
+# as it was, it is only wrapped with a timer while instrumentation is enabled.
+_hot_paths = []
+
+
+def instrumented(function):
+    # Modules imported lazily, once instrumentation is already enabled, are timed from the start.
+    if instrumentation.enabled:
+        return instrumentation.timed(function.__module__ + "." + function.__qualname__, function)
+    _hot_paths.append((function.__module__, function.__qualname__))
+    return function
+
+
+class Instrumentation:
+    """
+    Opt-in timers and call counters on the functions marked as hot paths. Enabling it swaps each marked function for
+    a timed wrapper and disabling it puts the original back, so a disabled draft runs the unmodified code.
+
+    Timings are inclusive, a hot path called from another counts toward both. Each pick cycle (the summary, the pick
+    and the save) is closed with `pick_finished`, which returns the breakdown of the cycle and appends it to the
+    json lines file if one was given.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.jsonl_filename = None
+        self.totals = {}
+        self.cycle = {}
+        self.cycle_started = None
+        self.cycles = 0
+        self.originals = []
+
+    def enable(self, jsonl_filename: str = None) -> None:
+        if self.enabled:
+            return
+        self.enabled = True
+        self.jsonl_filename = jsonl_filename
+        for module_name, qualified_name in _hot_paths:
+            owner = sys.modules[module_name]
+            *owner_names, attribute = qualified_name.split(".")
+            for owner_name in owner_names:
+                owner = getattr(owner, owner_name)
+            original = inspect.getattr_static(owner, attribute)
+            function = original.__func__ if isinstance(original, (staticmethod, classmethod)) else original
+            wrapper = self.timed(module_name + "." + qualified_name, function)
+            setattr(owner, attribute, type(original)(wrapper) if function is not original else wrapper)
+            self.originals.append((owner, attribute, original))
+        self.cycle_started = time.perf_counter()
+
+    def disable(self) -> None:
+        for owner, attribute, original in reversed(self.originals):
+            setattr(owner, attribute, original)
+        self.originals = []
+        self.enabled = False
+
+    def timed(self, name: str, function):
+        totals = self.totals
+        cycle = self.cycle
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                for counts in (totals, cycle):
+                    entry = counts.get(name)
+                    if entry is None:
+                        counts[name] = [1, elapsed]
+                    else:
+                        entry[0] += 1
+                        entry[1] += elapsed
+        return wrapper
+
+    def pick_finished(self, pick: int) -> dict:
+        now = time.perf_counter()
+        record = {"pick": pick, "cycle": self.cycles, "seconds": now - self.cycle_started,
+                  "calls": {name: {"count": count, "seconds": seconds}
+                            for name, (count, seconds) in sorted(self.cycle.items(), key=lambda e: -e[1][1])}}
+        self.cycle.clear()
+        self.cycles += 1
+        self.cycle_started = now
+        if self.jsonl_filename is not None:
+            with open(self.jsonl_filename, 'a') as jsonl_file:
+                jsonl_file.write(json.dumps(record) + "\n")
+        return record
+
+    def print_breakdown(self, record: dict, top_count: int = 8) -> None:
+        print("Pick " + str(record["pick"]) + " took " + format(record["seconds"] * 1000, ".1f") + "ms:")
+        for name, call in list(record["calls"].items())[:top_count]:
+            share = call["seconds"] / record["seconds"] * 100 if record["seconds"] else 0.0
+            print("  " + name.ljust(48) + str(call["count"]).rjust(7) + " calls " +
+                  format(call["seconds"] * 1000, ".1f").rjust(9) + "ms " + format(share, ".0f").rjust(4) + "%")
+
+
+class PickProfiler:
+    """
+    Profiles a single pick cycle with cProfile and dumps it in the pstats format that snakeviz, flameprof and
+    gprof2dot read.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.profile = None
+        self.done = False
+
+    def start(self) -> None:
+        if not self.done and self.profile is None:
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+
+    def stop(self) -> None:
+        if self.profile is None:
+            return
+        self.profile.disable()
+        self.profile.dump_stats(self.filename)
+        self.profile = None
+        self.done = True
+        print("Wrote the profile of one pick cycle to " + self.filename)
+
+
+instrumentation = Instrumentation()
+
+
+def from_environment(instrument: str = None, profile: str = None):
+    """
+    Enables instrumentation when FFD_INSTRUMENT (or the given value) is set, to the json lines file it names or to
+    "1" for printed breakdowns only, and returns a PickProfiler when FFD_PROFILE (or the given value) names a file.
+    """
+    instrument = instrument or os.environ.get("FFD_INSTRUMENT")
+    if instrument:
+        instrumentation.enable(None if instrument == "1" else instrument)
+    profile = profile or os.environ.get("FFD_PROFILE")
+    return PickProfiler(profile) if profile else None
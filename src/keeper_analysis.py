@@ -1,20 +1,156 @@
-from constants import Constants
-from models import Player
+import argparse
 import json
-from prettytable import PrettyTable
+
+import numpy as np
+
+from constants import Constants
+from models import Draft, Player
+from monte_carlo import MonteCarloSimulator
+from player_store import PlayerStore
+
+
+class KeeperEngine:
+    """
+    Values keepers against the round they cost and picks the keepers each team should hold on to.
+
+    Keeping a player gives up that team's pick in the keeper's round, so a keeper is worth their projected season
+    total less the expected season total of the player taken with that pick. The pick values of a league come from a
+    batch of simulated drafts of its size with its kept players off the board, and the name and position rank
+    indexes are built once, so valuing hundreds of keepers across many leagues is a handful of simulations and array
+    operations.
+
+    Each entry of keepers.json has a "name" and a "round" and may also name the "team" keeping them, as the 0-based
+    draft slot, the "league" they are kept in and that league's number of "drafters". Entries without a team belong
+    to `default_team` and leagues without a size have `total_drafters` teams.
+    """
+
+    def __init__(self, store: PlayerStore, total_drafters: int = 12, drafts: int = 200, workers: int = None,
+                 seed: int = 0):
+        self.store = store
+        self.total_drafters = total_drafters
+        self.drafts = drafts
+        self.workers = workers
+        self.seed = seed
+        self.name_index = {name: idx for idx, name in enumerate(store.names)}
+        self.position_ranks = store.position_ranks()
+        self.pick_values = {}
+
+    def round_values(self, rounds: int, total_drafters: int = None, kept: frozenset = frozenset()) -> np.ndarray:
+        """
+        The expected season total of each drafter's pick in each round of a league of `total_drafters` teams whose
+        `kept` players, store indices, are not in the draft, indexed [round - 1, slot]. Drafters pick in the same
+        order every round.
+        """
+        total_drafters = total_drafters if total_drafters is not None else self.total_drafters
+        key = (total_drafters, kept)
+        if self.pick_values.get(key, {}).get("rounds", 0) < rounds:
+            players = [Player(self.store, idx) for idx in range(len(self.store)) if idx not in kept]
+            draft = Draft(total_drafters, 0, players=players)
+            result = MonteCarloSimulator(draft, rounds=rounds, candidates=0, workers=self.workers,
+                                         seed=self.seed).run(self.drafts)
+            values = np.zeros(rounds * total_drafters)
+            values[:len(result.pick_scores)] = result.pick_scores
+            self.pick_values[key] = {"rounds": rounds, "values": values.reshape(rounds, total_drafters)}
+        return self.pick_values[key]["values"][:rounds]
+
+    def evaluate(self, keepers: list[dict], max_keepers: int, default_team: int) -> list[dict]:
+        """
+        Values every keeper and marks the ones to keep. A team keeps at most one player a round, since each round
+        has one pick to give up, and at most `max_keepers` players, choosing the keepers worth the most over their
+        picks. Keepers worth less than their pick are never kept.
+
+        Which players are kept depends on the pick values, and the pick values on which players are off the board,
+        so the keepers are first chosen against drafts without any of the league's keepers and then chosen again
+        against drafts without just the players kept.
+        """
+        found = [keeper for keeper in keepers if keeper["name"] in self.name_index]
+        for keeper in keepers:
+            if keeper["name"] not in self.name_index:
+                print("Could not find keeper " + keeper["name"] + ", skipping.")
+        if not found:
+            return []
+
+        indices = np.array([self.name_index[keeper["name"]] for keeper in found])
+        rounds = np.array([int(keeper["round"]) for keeper in found])
+        teams = np.array([int(keeper.get("team", default_team)) for keeper in found])
+        league_names = [str(keeper.get("league", "")) for keeper in found]
+        leagues = np.unique(league_names, return_inverse=True)[1]
+        sizes = {}
+        for keeper, league, league_name in zip(found, leagues.tolist(), league_names):
+            if "drafters" in keeper and sizes.setdefault(league, int(keeper["drafters"])) != int(keeper["drafters"]):
+                raise ValueError("The keepers of league " + league_name + " give different numbers of drafters")
+        sizes = {league: sizes.get(league, self.total_drafters) for league in np.unique(leagues).tolist()}
+        drafters = np.array([sizes[league] for league in leagues.tolist()])
+        if np.any(teams < 0) or np.any(teams >= drafters):
+            raise ValueError("Keeper teams must be draft slots from 0 to one less than their league's drafters")
+
+        values = self.store.totals[indices]
+        keep = np.ones(len(found), dtype=bool)
+        for _ in range(2):
+            costs = np.zeros(len(found))
+            for league, size in sizes.items():
+                rows = leagues == league
+                kept = frozenset(indices[rows & keep].tolist())
+                costs[rows] = self.round_values(int(rounds[rows].max()), size, kept)[rounds[rows] - 1, teams[rows]]
+            surplus = values - costs
+            keep = self.choose(surplus, rounds, teams, leagues, max_keepers)
+
+        return [{"league": league_names[row], "team": int(teams[row]), "name": found[row]["name"],
+                 "position": str(self.store.positions[indices[row]]), "round": int(rounds[row]),
+                 "overall_score": float(values[row]), "rank": int(self.position_ranks[indices[row]]),
+                 "round_value": float(costs[row]), "surplus": float(surplus[row]), "keep": bool(keep[row])}
+                for row in np.lexsort((rounds, teams, leagues))]
+
+    @staticmethod
+    def choose(surplus: np.ndarray, rounds: np.ndarray, teams: np.ndarray, leagues: np.ndarray,
+               max_keepers: int) -> np.ndarray:
+        """
+        Marks the keepers each team keeps, its best keeper of each round worth more than their pick, at most
+        `max_keepers` of them.
+        """
+        # Order by league, team, round and then surplus, best first, so the first keeper of each round is the one
+        # a team would keep for that round.
+        order = np.lexsort((-surplus, rounds, teams, leagues))
+        team_key = leagues[order] * (int(teams.max()) + 1) + teams[order]
+        round_key = team_key * (int(rounds.max()) + 1) + rounds[order]
+        best_of_round = np.ones(len(order), dtype=bool)
+        best_of_round[1:] = round_key[1:] != round_key[:-1]
+        candidates = order[best_of_round & (surplus[order] > 0)]
+
+        # The round constraint leaves independent choices, so each team simply keeps its best candidates.
+        by_team = candidates[np.lexsort((-surplus[candidates], teams[candidates], leagues[candidates]))]
+        team_key = leagues[by_team] * (int(teams.max()) + 1) + teams[by_team]
+        team_starts = np.flatnonzero(np.r_[True, team_key[1:] != team_key[:-1]])
+        team_ranks = np.arange(len(by_team)) - np.repeat(team_starts, np.diff(np.r_[team_starts, len(by_team)]))
+        keep = np.zeros(len(surplus), dtype=bool)
+        keep[by_team[team_ranks < max_keepers]] = True
+        return keep
 
 
 def main():
-    players = list(sorted(Player.load().values(), key=lambda p: p.overall_score(), reverse=True))
-    keeper_table = PrettyTable()
-    keeper_table.field_names = ["Name", "Overall Score", "Round", "Rank"]
-    with open(Constants.KEEPERS_FILENAME, 'r') as keepers_file:
+    parser = argparse.ArgumentParser(description="Values keepers against the picks they cost.")
+    parser.add_argument("--keepers", default=Constants.KEEPERS_FILENAME)
+    parser.add_argument("--max-keepers", type=int, default=3)
+    parser.add_argument("--team", type=int, default=4, help="draft slot of keepers that do not name a team")
+    parser.add_argument("--drafters", type=int, default=12, help="teams in leagues whose keepers do not give a size")
+    parser.add_argument("--drafts", type=int, default=200, help="simulated drafts used to value each pick")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    players = Player.load()
+    store = next(iter(players.values())).store
+    with open(args.keepers, 'r') as keepers_file:
         keepers = json.load(keepers_file)
-        for keeper in keepers:
-            player = [p for p in players if p.name == keeper["name"]][0]
-            positions = [p for p in players if p.position == player.position]
-            rank = [(idx, p) for idx, p in enumerate(positions) if p.name == player.name][0][0] + 1
-            keeper_table.add_row([player.name, format(player.overall_score(), ".2f"), keeper["round"], rank])
+    engine = KeeperEngine(store, args.drafters, args.drafts, args.workers)
+    from prettytable import PrettyTable
+    keeper_table = PrettyTable()
+    keeper_table.field_names = ["League", "Team", "Name", "Overall Score", "Round", "Rank", "Round Value",
+                                "Surplus", "Keep"]
+    for keeper in engine.evaluate(keepers, args.max_keepers, args.team):
+        keeper_table.add_row([keeper["league"], keeper["team"], keeper["name"],
+                              format(keeper["overall_score"], ".2f"), keeper["round"], keeper["rank"],
+                              format(keeper["round_value"], ".2f"), format(keeper["surplus"], ".2f"),
+                              "Yes" if keeper["keep"] else ""])
     print(keeper_table)
 
 
@@ -0,0 +1,85 @@
+import numpy as np
+
+from instrumentation import instrumented
+
+
+class LeagueProjection:
+    """
+    The projected best-ball season of every roster in a draft at one pick. Each week a roster scores its best
+    players at every starting group, the groups being the starter tables a Roster sets up (WR and TE share one table
+    and fill its three spots together). All rosters are projected at once: every group's rosters are padded into a
+    teams x players x weeks array and a single partial selection along the players axis picks every team's starters
+    for every week.
+
+    From the teams x weeks matrix of weekly scores come each team's season total, the spread of its weekly scores
+    and the projected standings, ranked by season total with each team's all-play record, its wins if it played
+    every other team every week.
+    """
+
+    PERCENTILES = [10, 50, 90]
+
+    @instrumented
+    def __init__(self, draft):
+        self.key = draft.board_key()
+        store = draft.pool.store
+        rosters = draft.rosters
+        self.weekly = np.zeros((len(rosters), len(store.weeks)))
+
+        # Positions sharing a starter table share their players too, so each group is read from its first position.
+        groups = {}
+        for name, position in rosters[0].positions.items():
+            groups.setdefault(id(position.starters), (name, position.starting_players))
+        for name, starting_players in groups.values():
+            members = [roster.positions[name].players for roster in rosters]
+            counts = np.array([len(players) for players in members])
+            if not counts.any():
+                continue
+            slots = max(int(counts.max()), starting_players)
+            teams = np.repeat(np.arange(len(rosters)), counts)
+            columns = np.arange(len(teams)) - np.repeat(np.cumsum(counts) - counts, counts)
+            indices = np.full((len(rosters), slots), -1)
+            indices[teams, columns] = [player.index for players in members for player in players]
+            scores = np.where((indices >= 0)[:, :, None], store.starter_scores(np.maximum(indices, 0)), -np.inf)
+            if slots > starting_players:
+                scores = -np.partition(-scores, starting_players - 1, axis=1)[:, :starting_players]
+            # A week with fewer players than starting spots leaves the empty spots scoring nothing.
+            self.weekly += np.where(np.isneginf(scores), 0.0, scores).sum(axis=1)
+
+        self.totals = self.weekly.sum(axis=1)
+        self.mean = self.weekly.mean(axis=1) if self.weekly.size else np.zeros(len(rosters))
+        self.std = self.weekly.std(axis=1) if self.weekly.size else np.zeros(len(rosters))
+        self.percentiles = (np.percentile(self.weekly, self.PERCENTILES, axis=1) if self.weekly.size
+                            else np.zeros((len(self.PERCENTILES), len(rosters))))
+        # Every pair of teams meets every week, a tie counting as half a win for each.
+        beats = (self.weekly[:, None, :] > self.weekly[None, :, :]).sum(axis=(1, 2))
+        ties = (self.weekly[:, None, :] == self.weekly[None, :, :]).sum(axis=(1, 2)) - self.weekly.shape[1]
+        self.all_play_wins = beats + 0.5 * ties
+        self.all_play_games = (len(rosters) - 1) * self.weekly.shape[1]
+        self.order = np.lexsort((np.arange(len(rosters)), -self.all_play_wins, -self.totals))
+
+    def standings(self) -> list[dict]:
+        return [{"rank": rank, "team": int(team), "season_total": float(self.totals[team]),
+                 "weekly_mean": float(self.mean[team]), "weekly_std": float(self.std[team]),
+                 **{"weekly_p" + str(percentile): float(self.percentiles[idx, team])
+                    for idx, percentile in enumerate(self.PERCENTILES)},
+                 "all_play_wins": float(self.all_play_wins[team]),
+                 "all_play_losses": float(self.all_play_games - self.all_play_wins[team])}
+                for rank, team in enumerate(self.order.tolist(), start=1)]
+
+    def print(self, my_position: int = None) -> None:
+        from prettytable import PrettyTable
+
+        standings_table = PrettyTable()
+        standings_table.field_names = ["Rank", "Team", "Season Total", "Weekly Mean", "Weekly Std",
+                                       *["Week P" + str(percentile) for percentile in self.PERCENTILES],
+                                       "All-Play Record"]
+        standings_table.float_format = ".2"
+        for standing in self.standings():
+            team = str(standing["team"]) + (" (me)" if standing["team"] == my_position else "")
+            standings_table.add_row([standing["rank"], team, standing["season_total"], standing["weekly_mean"],
+                                     standing["weekly_std"],
+                                     *[standing["weekly_p" + str(percentile)] for percentile in self.PERCENTILES],
+                                     format(standing["all_play_wins"], "g") + "-" +
+                                     format(standing["all_play_losses"], "g")])
+        print("Projected Standings:")
+        print(standings_table)
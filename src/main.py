@@ -1,17 +1,81 @@
+import argparse
+
+from constants import Constants
+from instrumentation import from_environment, instrumentation
 from models import Draft
+from pick_journal import PickJournal
+from scoring import ScoringConfig
+
+
+def enable_completion(draft: Draft) -> None:
+    """
+    Completes player names on tab from the draft's available players, where readline is available.
+    """
+    try:
+        import readline
+    except ImportError:
+        return
+
+    def complete(text, state):
+        names = [player.name for player in draft.pool.complete(readline.get_line_buffer())]
+        return names[state] if state < len(names) else None
+
+    readline.set_completer_delims("")
+    readline.set_completer(complete)
+    readline.parse_and_bind("tab: complete")
+
+
+def choose_player(player_name: str, suggestions: list):
+    print("No player is named " + player_name + ", did you mean:")
+    for number, player in enumerate(suggestions, start=1):
+        print("  " + str(number) + ". " + player.name + " (" + player.position + ", " + player.team + ")")
+    choice = input("Choose a number (or press enter to retype):").strip()
+    if choice.isdigit() and 1 <= int(choice) <= len(suggestions):
+        return suggestions[int(choice) - 1]
+    return None
 
 
-def start_draft():
-    draft = Draft(12, my_position=4)
+def start_draft(profiler=None, scoring_rules=None):
+    journal = PickJournal(Constants.PICK_JOURNAL_FILENAME, Constants.PICK_SNAPSHOT_FILENAME)
+    draft = Draft(12, my_position=4, journal=journal, scoring_rules=scoring_rules)
+    # Built now rather than at the first misspelled name, while the draft clock is running.
+    draft.pool.index_names()
+    enable_completion(draft)
     while True:
+        if profiler is not None:
+            profiler.start()
         draft.print_summary()
-        player_name = input("Enter player name:")
-        draft.select(player_name)
+        player_name = input("Enter player name (or undo, standings):")
+        if player_name == "undo":
+            draft.unselect()
+        elif player_name == "standings":
+            draft.print_standings()
+        else:
+            player, suggestions = draft.resolve(player_name)
+            if player is None and suggestions:
+                player = choose_player(player_name, suggestions)
+            if player is not None:
+                draft.select_player(player)
+            elif not suggestions:
+                print("Could not find player " + player_name + " please try again.")
         draft.save()
+        if profiler is not None:
+            profiler.stop()
+        if instrumentation.enabled:
+            instrumentation.print_breakdown(instrumentation.pick_finished(len(draft.pick_log)))
 
 
 def main():
-    start_draft()
+    parser = argparse.ArgumentParser(description="Assists with a best ball draft.")
+    parser.add_argument("--instrument", nargs="?", const="1", metavar="JSONL",
+                        help="time the hot paths and print a breakdown of every pick, also appending it to JSONL if "
+                             "given (or set FFD_INSTRUMENT)")
+    parser.add_argument("--profile", metavar="FILE",
+                        help="dump a cProfile of one pick cycle to FILE (or set FFD_PROFILE)")
+    parser.add_argument("--scoring", help="scoring rules to draft with, from " + Constants.SCORING_RULES_FILENAME)
+    args = parser.parse_args()
+    scoring_rules = ScoringConfig.load(Constants.SCORING_RULES_FILENAME).get(args.scoring)
+    start_draft(from_environment(args.instrument, args.profile), scoring_rules)
 
 
 if __name__ == "__main__":
@@ -1,88 +1,142 @@
-import json
+import heapq
+import itertools
 import pickle
-import copy
 
-from prettytable.colortable import ColorTable, Themes
-from prettytable import PrettyTable
+import numpy as np
 
 from constants import Constants
+from draft_summary import BoardSnapshot
+from instrumentation import instrumented
+from league_projection import LeagueProjection
+from name_index import NameIndex
+from pick_journal import PickJournal
+from player_store import PlayerStore
+from scoring import ScoringConfig, ScoringRules
 
 
 class PlayerStats:
     """
     This class represents the statistics a player had (or is predicted to have) in a given game. This is to
     allow for dynamic allocation of additional roster adds wherein a player might not have the best predicted
-    score, but is a good roster fit due to byes etc.
+    score, but is a good roster fit due to byes etc. It is a view over a single player week of a PlayerStore.
     """
 
-    def __init__(self, passing_yards: str, passing_td: str, interceptions: str, rushing_yards: str, rushing_td: str,
-                 fumbles: str, receiving_yards: str, receiving_td: str):
-        self.passing_yards = self.parse(passing_yards)
-        self.passing_td = self.parse(passing_td)
-        self.interceptions = self.parse(interceptions)
-        self.rushing_yards = self.parse(rushing_yards)
-        self.rushing_td = self.parse(rushing_td)
-        self.receiving_yards = self.parse(receiving_yards)
-        self.receiving_td = self.parse(receiving_td)
-        self.fumbles = self.parse(fumbles)
+    def __init__(self, store: PlayerStore, player_index: int, week_index: int):
+        self.store = store
+        self.player_index = player_index
+        self.week_index = week_index
+
+    def __getattr__(self, category: str) -> float:
+        if category not in PlayerStore.STAT_CATEGORIES:
+            raise AttributeError(category)
+        return float(self.store.stats[self.player_index, self.week_index, self.store.category_index(category)])
 
     def score(self) -> float:
-        return self.passing_td * 3 + (
-                self.passing_yards / 50) - self.interceptions + self.rushing_td * 3 + (
-                       self.rushing_yards / 30) - self.fumbles + self.receiving_td * 3 + (self.receiving_yards / 30)
+        return float(self.store.points[self.player_index, self.week_index])
 
     @staticmethod
     def parse(value: str) -> float:
-        try:
-            return float(value)
-        except ValueError:
-            return 0.0
+        return PlayerStore.parse(value)
 
 
 class Player:
     """
     This class represents an offensive player and their projected stats per week. Used to optimize
-    drafted players that complement an existing draft very well.
+    drafted players that complement an existing draft very well. It is a view over a row of a PlayerStore.
     """
 
-    def __init__(self, stats: dict[int, PlayerStats], name: str, position: str, team: str):
-        self.stats = stats
-        self.name = name
-        self.position = position
-        self.team = team
+    def __init__(self, store: PlayerStore, index: int):
+        self.store = store
+        self.index = index
+        self.name = store.names[index]
+        self.position = str(store.positions[index])
+        self.team = store.teams[index]
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return Player, (self.store, self.index)
+
+    @property
+    def stats(self) -> dict[str, PlayerStats]:
+        return {week: PlayerStats(self.store, self.index, week_idx) for week_idx, week in enumerate(self.store.weeks)
+                if self.store.played[self.index, week_idx]}
+
+    def weekly_scores(self) -> np.ndarray:
+        return self.store.points[self.index]
 
+    @instrumented
     def overall_score(self) -> float:
-        return sum(map(lambda stat: stat.score(), self.stats.values()))
+        return float(self.store.totals[self.index])
 
     @staticmethod
-    def load():
-        players = {}
-        with open(Constants.PROJECTED_PLAYER_STATS_FILENAME, 'r') as player_stats_file:
-            player_stats = json.load(player_stats_file)
-            for week, stats in player_stats.items():
-                for stat in stats:
-                    if stat['player_name'] not in players:
-                        players[stat['player_name']] = Player({}, stat['player_name'], stat['player_position'],
-                                                              stat['player_team'])
-                    players[stat['player_name']].stats[week] = PlayerStats(passing_yards=stat['passing_yards'],
-                                                                           passing_td=stat['passing_tds'],
-                                                                           interceptions=stat['interceptions'],
-                                                                           rushing_yards=stat['rushing_yards'],
-                                                                           rushing_td=stat['rushing_tds'],
-                                                                           receiving_yards=stat['receiving_yards'],
-                                                                           receiving_td=stat['receiving_tds'],
-                                                                           fumbles=stat['fumbles'])
-        return players
+    @instrumented
+    def load(scoring_rules: ScoringRules = None):
+        """
+        Loads every player scored under the given rules, the default rules of the scoring rules file if none are given.
+        """
+        if scoring_rules is None:
+            scoring_rules = ScoringConfig.load(Constants.SCORING_RULES_FILENAME).get()
+        store = PlayerStore.load(Constants.PROJECTED_PLAYER_STATS_FILENAME, Constants.PLAYER_STORE_BUNDLE,
+                                 scoring_rules.weights, Constants.SNAPSHOT_DIR)
+        return {name: Player(store, idx) for idx, name in enumerate(store.names)}
+
+
+class StarterTable:
+    """
+    Keeps the top starting scores for every week of a position, sorted best first, so that the value a new player
+    adds in a week is a single comparison against the current k-th best starter.
+    """
+
+    _versions = itertools.count()
+
+    def __init__(self, starting_players: int):
+        self.starting_players = starting_players
+        self.starters = None
+        self.version = next(self._versions)
+
+    @instrumented
+    def add(self, player: Player) -> None:
+        scores = player.store.starter_scores(player.index)
+        if self.starters is None:
+            self.starters = np.full((self.starting_players, len(scores)), -np.inf)
+        if np.any(scores > self.starters[-1]):
+            self.starters = -np.sort(-np.vstack([self.starters, scores]), axis=0)[:self.starting_players]
+            self.version = next(self._versions)
+
+    def state(self) -> tuple:
+        return self.starters, self.version
+
+    def restore(self, state: tuple) -> None:
+        self.starters, self.version = state
+
+    def kth_starter(self) -> np.ndarray:
+        if self.starters is None:
+            return np.zeros(1)
+        # A week with fewer projected players than starting spots has no starter to displace.
+        return np.where(np.isneginf(self.starters[-1]), 0.0, self.starters[-1])
+
+    def total(self) -> float:
+        if self.starters is None:
+            return 0.0
+        return float(np.where(np.isneginf(self.starters), 0.0, self.starters).sum())
+
+    def marginal_scores(self, store: PlayerStore, indices: np.ndarray) -> np.ndarray:
+        deltas = np.maximum(store.points[indices] - self.kth_starter(), 0.0)
+        return np.where(store.played[indices], deltas, 0.0).sum(axis=-1)
 
 
 class Position:
     RECEIVERS = ["WR", "TE"]
 
-    def __init__(self, position: str, players: list[Player], max_players: int, starting_players: int):
+    def __init__(self, position: str, players: list[Player], max_players: int, starting_players: int,
+                 starters: StarterTable = None):
         self.posision = position
         self.players = players
         self.max_players = max_players
         self.starting_players = starting_players
+        self.starters = starters if starters is not None else StarterTable(starting_players)
 
     def has_spot(self) -> bool:
         return len(self.players) < self.max_players
@@ -90,6 +144,12 @@ class Position:
     def has_starting_spot(self) -> bool:
         return len(self.players) < self.starting_players
 
+    def ranking_key(self) -> tuple:
+        """
+        Changes whenever the net additional score of a player at this position could have changed.
+        """
+        return self.starters.version, self.has_spot(), self.has_starting_spot()
+
     def matching_players(self, player: Player) -> list[Player]:
         if player.position in self.RECEIVERS and self.posision in self.RECEIVERS:
             return self.players
@@ -102,17 +162,30 @@ class Roster:
     def __init__(self):
         self.positions = {}
         receivers = []
+        receiver_starters = StarterTable(3)
         self.positions["QB"] = Position("QB", [], 3, 1)
         self.positions["RB"] = Position("RB", [], 10, 2)
-        self.positions["WR"] = Position("WR", receivers, 11, 3)
-        self.positions["TE"] = Position("TE", receivers, 11, 3)
+        self.positions["WR"] = Position("WR", receivers, 11, 3, receiver_starters)
+        self.positions["TE"] = Position("TE", receivers, 11, 3, receiver_starters)
 
         self.all_players = []
 
     def add(self, player: Player) -> None:
         self.positions[player.position].players.append(player)
+        self.positions[player.position].starters.add(player)
         self.all_players.append(player)
 
+    def remove(self, player: Player) -> None:
+        self.positions[player.position].players.remove(player)
+        self.all_players.remove(player)
+
+    def best_ball_total(self) -> float:
+        """
+        The season total of the roster when its best players at every position start each week.
+        """
+        starter_tables = {id(position.starters): position.starters for position in self.positions.values()}
+        return sum(starters.total() for starters in starter_tables.values())
+
     def has_spot(self, player: Player) -> bool:
         position = self.positions[player.position]
         return position.has_spot()
@@ -122,11 +195,12 @@ class Roster:
         return position.has_starting_spot()
 
     def matching_players(self, player: Player) -> list[Player]:
-        return [p for position in self.positions.values() for p in position.matching_players(player)]
+        return self.positions[player.position].matching_players(player)
 
     def starting_positions(self, player: Player) -> int:
         return self.positions[player.position].starting_players
 
+    @instrumented
     def net_additional_score(self, player: Player) -> float:
         if not self.has_spot(player):
             return 0.0
@@ -134,35 +208,40 @@ class Roster:
         if self.has_starting_spot(player):
             return player.overall_score()
 
-        matching_players = self.matching_players(player)
-        current_weekly_maxes = map(lambda p: {w: s.score() for w, s in p.stats.items()},
-                                   matching_players)
-
-        def merge_dicts(dicts):
-            merged_dict = {}
-            for d in dicts:
-                for key, value in d.items():
-                    merged_dict[key] = merged_dict.get(key, []) + [value]
-            return merged_dict
-
-        current_weekly_merged = merge_dicts(list(current_weekly_maxes))
-
-        total_delta = 0.0
-        for week, stat in player.stats.items():
-            weekly_maxes = sorted(current_weekly_merged[week], reverse=True)[:self.starting_positions(player)]
-            weekly_max = sum(weekly_maxes)
-            weekly_score = stat.score()
-            with_weekly = sum(sorted(weekly_maxes + [weekly_score], reverse=True)[:self.starting_positions(player)])
-            delta = with_weekly - weekly_max
-            if delta > 0.0:
-                total_delta += delta
-        return total_delta
-
+        return float(self.positions[player.position].starters.marginal_scores(player.store, player.index))
+
+    def net_additional_scores(self, players: list[Player]) -> np.ndarray:
+        """
+        Scores every candidate against this roster in one pass, equivalent to calling net_additional_score on each.
+        """
+        if not players:
+            return np.zeros(0)
+        return self.net_additional_scores_at(players[0].store, np.array([p.index for p in players]))
+
+    @instrumented
+    def net_additional_scores_at(self, store: PlayerStore, indices: np.ndarray) -> np.ndarray:
+        """
+        Scores the players at the given store indices against this roster.
+        """
+        player_positions = store.positions[indices]
+        scores = np.zeros(len(indices))
+        for name, position in self.positions.items():
+            matches = player_positions == name
+            if not matches.any() or not position.has_spot():
+                continue
+            if position.has_starting_spot():
+                scores[matches] = store.totals[indices[matches]]
+            else:
+                scores[matches] = position.starters.marginal_scores(store, indices[matches])
+        return scores
+
+    @instrumented
     def save(self):
         with open(Constants.ROSTER_PICKLE_FILENAME, 'wb') as roster_pickle_file:
             pickle.dump(self, roster_pickle_file)
 
     @staticmethod
+    @instrumented
     def load():
         try:
             with open(Constants.ROSTER_PICKLE_FILENAME, 'rb') as roster_pickle_file:
@@ -173,139 +252,332 @@ class Roster:
             return Roster()
 
 
+class PlayerPool:
+    """
+    The players still available in a draft. Available players are indexed by name and every player the pool started
+    with is bucketed by position. Each roster's ranking of a position is kept as a heap which is only rebuilt when
+    that roster's starters for the position change. Players drafted since a heap was built are dropped from it lazily
+    as they surface and pushed back if they are restored.
+    """
+
+    def __init__(self, players):
+        self.players = {}
+        self.positions = {}
+        self.rankings = {}
+        self.starting_rankings = {}
+        self.by_index = {}
+        for player in players:
+            self.players[player.name] = player
+            self.by_index[player.index] = player
+            self.positions.setdefault(player.position, []).append(player)
+        self.indices = {position: np.array([p.index for p in players], dtype=np.int64)
+                        for position, players in self.positions.items()}
+        self.store = next(iter(self.players.values())).store if self.players else None
+        self.available = np.zeros(len(self.store) if self.store is not None else 0, dtype=bool)
+        self.available[[p.index for p in self.players.values()]] = True
+
+    def __len__(self) -> int:
+        return len(self.players)
+
+    def __iter__(self):
+        return iter(self.players.values())
+
+    def __contains__(self, player: Player) -> bool:
+        return player.name in self.players
+
+    def find(self, player_name: str):
+        return self.players.get(player_name)
+
+    def index_names(self):
+        """
+        The fuzzy name index of the pool's store. Building it takes a while for a large store, so a draft entering
+        names builds it up front rather than at its first misspelled pick.
+        """
+        return NameIndex.of(self.store) if self.store is not None else None
+
+    def complete(self, prefix: str, limit: int = 10) -> list[Player]:
+        """
+        The available players whose name, or any word of it, starts with the prefix, best players first.
+        """
+        if self.store is None:
+            return []
+        return [self.by_index[idx] for idx in self.index_names().complete(prefix, self.available, limit)]
+
+    def search(self, query: str, limit: int = 5) -> list[tuple]:
+        """
+        The available players whose names most closely match the query, as (player, similarity) pairs, best first.
+        """
+        if self.store is None:
+            return []
+        return [(self.by_index[idx], similarity)
+                for idx, similarity in self.index_names().search(query, self.available, limit)]
+
+    def remove(self, player: Player) -> None:
+        del self.players[player.name]
+        self.available[player.index] = False
+
+    def restore(self, player: Player) -> None:
+        self.players[player.name] = player
+        self.by_index[player.index] = player
+        self.available[player.index] = True
+        for (_, position), (_, _, heap, dropped) in self.rankings.items():
+            if position == player.position and player.index in dropped:
+                heapq.heappush(heap, dropped.pop(player.index))
+
+    @instrumented
+    def ranking(self, roster: Roster, position: str) -> tuple[list[tuple], dict]:
+        key = roster.positions[position].ranking_key()
+        cached = self.rankings.get((id(roster), position))
+        if cached is not None and cached[1] == key:
+            return cached[2], cached[3]
+
+        if roster.positions[position].has_starting_spot():
+            indices, entries = self.starting_ranking(position)
+        else:
+            candidates = self.positions.get(position, [])
+            indices = self.indices.get(position, np.zeros(0, dtype=np.int64))
+            scores = roster.net_additional_scores_at(self.store, indices) if candidates else np.zeros(0)
+            totals = self.store.totals[indices] if candidates else np.zeros(0)
+            entries = list(zip((-scores).tolist(), (-totals).tolist(), indices.tolist(), candidates))
+        available = self.available[indices]
+        heap = list(itertools.compress(entries, available))
+        heapq.heapify(heap)
+        dropped = {entry[2]: entry for entry in itertools.compress(entries, ~available)}
+        self.rankings[(id(roster), position)] = (roster, key, heap, dropped)
+        return heap, dropped
+
+    def starting_ranking(self, position: str) -> tuple[np.ndarray, list[tuple]]:
+        """
+        While a roster has a starting spot at a position every player there adds their whole season total, so every
+        such roster ranks the position in the store's precomputed order. It is built once and shared by them all.
+        """
+        if position not in self.starting_rankings:
+            players = {player.index: player for player in self.positions.get(position, [])}
+            indices = np.array([idx for idx in self.store.ranked(position).tolist() if idx in players], dtype=np.int64)
+            totals = self.store.totals[indices]
+            entries = list(zip((-totals).tolist(), (-totals).tolist(), indices.tolist(),
+                               [players[idx] for idx in indices.tolist()]))
+            self.starting_rankings[position] = (indices, entries)
+        return self.starting_rankings[position]
+
+    def top(self, roster: Roster, count: int, positions: list[str] = None) -> list[Player]:
+        """
+        Returns the best available players for the roster by net additional score then overall score.
+        """
+        entries = []
+        for position in positions if positions is not None else list(self.positions.keys()):
+            heap, dropped = self.ranking(roster, position)
+            best = []
+            while heap and len(best) < count:
+                entry = heapq.heappop(heap)
+                if self.available[entry[2]]:
+                    best.append(entry)
+                else:
+                    dropped[entry[2]] = entry
+            for entry in best:
+                heapq.heappush(heap, entry)
+            entries.extend(best)
+        return [entry[3] for entry in heapq.nsmallest(count, entries)]
+
+    def best(self, roster: Roster, positions: list[str] = None):
+        best = self.top(roster, 1, positions)
+        return best[0] if best else None
+
+    def ranked(self, roster: Roster) -> list[Player]:
+        return self.top(roster, len(self))
+
+
 class Draft:
+    # Names sharing fewer trigrams than this with the entered name are not worth suggesting.
+    MIN_SIMILARITY = 0.3
 
-    def __init__(self, total_drafters: int, my_position: int):
+    def __init__(self, total_drafters: int, my_position: int, players: list[Player] = None,
+                 rosters: list[Roster] = None, current_position: int = 0, journal: PickJournal = None,
+                 scoring_rules: ScoringRules = None):
         self.total_drafters = total_drafters
         self.my_position = my_position
-        self.load_rosters()
-        self.available_players = sorted(self.load_players(), key=lambda player: (
-            self.current_roster().net_additional_score(player), player.overall_score()), reverse=True)
-        self.total_drafters = total_drafters
+        self.rosters = rosters if rosters is not None else [Roster() for _ in range(total_drafters)]
+        self.current_position = current_position
+        self.pool = PlayerPool(players if players is not None else Player.load(scoring_rules).values())
+        self.pick_log = []
+        self.picks_hash = 0
+        self.board = None
+        self.projection = None
+        # Only a draft given a journal is journaled, it resumes from the journal's picks.
+        self.journal = journal
+        if self.journal is not None:
+            self.replay()
+
+    @property
+    def available_players(self) -> list[Player]:
+        return self.pool.ranked(self.current_roster())
 
     def current_roster(self):
         return self.rosters[self.current_position]
 
-    @staticmethod
-    def load_players() -> list[Player]:
-        try:
-            with open(Constants.PLAYER_PICKLE_FILENAME, 'rb') as player_pickle_file:
-                return pickle.load(player_pickle_file)
-
-        except Exception as e:
-            print(e)
-            return Player.load().values()
-
-    def load_rosters(self):
-        try:
-            with open(Constants.ROSTERS_PICKLE_FILENAME, 'rb') as rosters_pickle_file:
-                rosters_and_current_position = pickle.load(rosters_pickle_file)
-                self.rosters = rosters_and_current_position["rosters"]
-                self.current_position = rosters_and_current_position["current_position"]
-
-        except Exception as e:
-            print(e)
-            self.rosters = [Roster() for _ in range(self.total_drafters)]
-            self.current_position = 0
+    def replay(self) -> None:
+        for slot, player_name in self.journal.picks():
+            player = self.find(player_name)
+            if player is None:
+                raise ValueError("Pick journal " + self.journal.filename + " picks " + player_name +
+                                 " who is not available")
+            self.current_position = slot
+            self.pick(player)
 
+    @instrumented
     def save(self) -> None:
-        with open(Constants.PLAYER_PICKLE_FILENAME, 'wb') as player_pickle_file:
-            pickle.dump([p for p in self.available_players], player_pickle_file)
-        with open(Constants.ROSTERS_PICKLE_FILENAME, 'wb') as rosters_pickle_file:
-            pickle.dump({"current_position": self.current_position, "rosters": [r for r in self.rosters]},
-                        rosters_pickle_file)
+        """
+        Picks are journaled as they are made, saving only compacts the journal into a snapshot once it has grown.
+        """
+        if self.journal is not None and self.journal.records >= PickJournal.COMPACT_EVERY:
+            self.journal.compact([(slot, player.name) for slot, player, _ in self.pick_log])
 
     def find(self, player_name: str):
-        player_found = None
-        for player in self.available_players:
-            if player_name == player.name:
-                player_found = player
-        return player_found
+        return self.pool.find(player_name)
+
+    def resolve(self, player_name: str, suggestions: int = 5) -> tuple:
+        """
+        Returns the player an entered name means, either the player with exactly that name or the only one whose
+        name is the same once normalized, and otherwise the closest matching available players, best first.
+        """
+        player = self.find(player_name)
+        if player is not None:
+            return player, []
+        matches = self.pool.search(player_name, suggestions)
+        if matches and matches[0][1] == 1.0 and (len(matches) == 1 or matches[1][1] < 1.0):
+            return matches[0][0], []
+        return None, [player for player, similarity in matches if similarity >= self.MIN_SIMILARITY]
 
     def select(self, player_name: str) -> None:
-        player_to_add = self.find(player_name)
+        player_to_add, suggestions = self.resolve(player_name)
         if player_to_add is None:
-            print("Could not find player " + player_name + " please try again.")
+            print("Could not find player " + player_name + " please try again." +
+                  (" Did you mean " + ", ".join(player.name for player in suggestions) + "?" if suggestions else ""))
             return
 
-        self.current_roster().add(player_to_add)
-        self.rotate_rosters()
-        self.remove_player_from_available_list(player_to_add)
+        self.select_player(player_to_add)
+
+    def unselect(self) -> None:
+        """
+        Undoes the last pick, for when the wrong player was entered.
+        """
+        if not self.pick_log:
+            print("There are no picks to undo.")
+            return
+
+        player = self.unselect_player()
+        print("Undid the pick of " + player.name + ".")
+
+    def unselect_player(self) -> Player:
+        """
+        Undoes the last pick for real, journaling the undo, and returns the player who was picked.
+        """
+        player = self.undo()
+        if self.journal is not None:
+            self.journal.undo(len(self.pick_log) + 1)
+        return player
 
     def select_next_best_available(self):
-        player = self.next_best_available()
+        self.select_player(self.next_best_available())
+
+    def select_player(self, player: Player) -> None:
+        """
+        Makes a pick for real, journaling it so that it survives a restart, unlike the picks made while simulating.
+        """
+        slot = self.current_position
+        self.pick(player)
+        if self.journal is not None:
+            self.journal.append(len(self.pick_log), slot, player.name)
+
+    @instrumented
+    def pick(self, player: Player) -> None:
+        """
+        Adds the player to the current roster and records enough in the pick log for the pick to be undone.
+        """
+        starters = self.current_roster().positions[player.position].starters
+        self.pick_log.append((self.current_position, player, starters.state()))
+        self.picks_hash ^= hash((self.current_position, player.index))
         self.current_roster().add(player)
         self.rotate_rosters()
         self.remove_player_from_available_list(player)
 
+    @instrumented
+    def undo(self) -> Player:
+        position, player, starters_state = self.pick_log.pop()
+        self.picks_hash ^= hash((position, player.index))
+        self.current_position = position
+        self.current_roster().remove(player)
+        self.current_roster().positions[player.position].starters.restore(starters_state)
+        self.pool.restore(player)
+        return player
+
     def next_best_available(self):
-        return \
-            sorted(self.available_players, key=lambda p: self.current_roster().net_additional_score(p), reverse=True)[0]
+        return self.pool.best(self.current_roster())
 
     def remove_player_from_available_list(self, player):
-        without_player = [p for p in self.available_players if p.name != player.name]
-        self.available_players = sorted(without_player,
-                                        key=lambda p: (
-                                            self.current_roster().net_additional_score(p), p.overall_score()),
-                                        reverse=True)
-
+        self.pool.remove(player)
+
+    def board_key(self) -> tuple:
+        """
+        Identifies the state of the draft, the picks made by each drafter and whose pick it is. Picks that are made
+        and undone again, as simulations and searches do, leave the key as it was.
+        """
+        return self.picks_hash, len(self.pick_log), self.current_position
+
+    def current_board(self) -> BoardSnapshot:
+        if self.board is None or self.board.key != self.board_key():
+            self.board = BoardSnapshot(self)
+        return self.board
+
+    def league_projection(self) -> LeagueProjection:
+        """
+        The best-ball projection of every roster as the draft stands, computed once per pick.
+        """
+        if self.projection is None or self.projection.key != self.board_key():
+            self.projection = LeagueProjection(self)
+        return self.projection
+
+    def print_standings(self) -> None:
+        self.league_projection().print(self.my_position)
+
+    @instrumented
     def print_summary(self):
-        available_table = PrettyTable()
-        roster_table = PrettyTable()
+        self.current_board().print()
         if self.current_position == self.my_position:
-            roster_table = ColorTable(theme=Themes.OCEAN)
-            available_table = ColorTable(theme=Themes.OCEAN)
-
-        available_table.field_names = ["Name", "Position", "Net Additional Score", "Overall Score",
-                                       "Points Against Next Best", "Team"]
-        available_table.float_format = ".2"
-
-        roster_table.field_names = ["Name", "Position Drafted", "Position", "Team"]
-
-        for index, player in enumerate(self.current_roster().all_players):
-            roster_table.add_row([player.name, index + 1, player.position, player.team])
-
-        future_draft = self.simulate_to_next_round()
-        next_best = sorted(future_draft.available_players,
-                           key=lambda p: self.current_roster().net_additional_score(p), reverse=True)[0]
-        next_best_qb = sorted(filter(lambda p: p.position == "QB", future_draft.available_players),
-                              key=lambda p: self.current_roster().net_additional_score(p), reverse=True)[0]
-        next_best_rb = sorted(filter(lambda p: p.position == "RB", future_draft.available_players),
-                              key=lambda p: self.current_roster().net_additional_score(p), reverse=True)[0]
-        next_best_wr_or_te = sorted(
-            filter(lambda p: p.position == "TE" or p.position == "WR", future_draft.available_players),
-            key=lambda p: self.current_roster().net_additional_score(p), reverse=True)[0]
-
-        top_count = 7
-        top = self.available_players[:top_count]
-        top_qb = list(filter(lambda p: p.position == "QB", self.available_players))[:top_count]
-        top_rb = list(filter(lambda p: p.position == "RB", self.available_players))[:top_count]
-        top_receiver = list(filter(lambda p: p.position == "WR" or p.position == "TE", self.available_players))[
-                       :top_count]
-        self.add_players(available_table, top_qb, next_best_qb)
-        self.add_players(available_table, top_rb, next_best_rb)
-        self.add_players(available_table, top_receiver, next_best_wr_or_te)
-        self.add_players(available_table, top, next_best)
-        print("Roster:")
-        print(roster_table)
+            self.print_recommendation()
+
+    @instrumented
+    def print_recommendation(self, time_budget: float = 2.0):
+        from prettytable.colortable import ColorTable, Themes
+        from pick_search import PickSearch
+
+        board = self.current_board()
+        if board.recommendation is None:
+            board.recommendation = PickSearch(self).search(time_budget=time_budget)
+        result = board.recommendation
+        if result is None:
+            return
+        recommendation_table = ColorTable(theme=Themes.OCEAN)
+        recommendation_table.field_names = ["Recommended Pick", "Position", "Projected Total", "Picks Ahead", "Team"]
+        recommendation_table.float_format = ".2"
+        recommendation_table.add_row([result.player.name, result.player.position, result.projected_total,
+                                      result.depth, result.player.team])
         print("")
-        print("Available Players:")
-        print(available_table)
-
-    def add_players(self, table: PrettyTable, players: list[Player], next_best: Player):
-        for player in players:
-            last_player = player.name == players[-1].name
-            table.add_row(
-                [player.name, player.position, self.current_roster().net_additional_score(player),
-                 player.overall_score(),
-                 player.overall_score() - next_best.overall_score(), player.team],
-                divider=last_player)
-
-    def simulate_to_next_round(self):
-        copy_draft = copy.deepcopy(self)
-        for _ in range(self.total_drafters):
-            copy_draft.select_next_best_available()
-        return copy_draft
+        print(recommendation_table)
+
+    @instrumented
+    def simulate_to_next_round(self) -> list[Player]:
+        """
+        Plays every drafter's next best available pick up to the current roster's next turn and returns the players
+        taken. The picks are undone afterwards so the draft is left exactly as it was.
+        """
+        future_picks = []
+        for _ in range(min(self.total_drafters, len(self.pool))):
+            self.pick(self.next_best_available())
+            future_picks.append(self.pick_log[-1][1])
+        for _ in future_picks:
+            self.undo()
+        return future_picks
 
     def rotate_rosters(self):
         self.current_position = (self.current_position + 1) % self.total_drafters
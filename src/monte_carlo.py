@@ -0,0 +1,264 @@
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from constants import Constants
+from models import Draft, Player, Roster
+from pick_journal import PickJournal
+from player_store import PlayerStore
+
+
+class GreedyOpponent:
+    """
+    Opponent model that always takes the best available player for their roster, as simulate_to_next_round does.
+    """
+
+    def choose(self, draft: Draft, rng: np.random.Generator) -> Player:
+        return draft.next_best_available()
+
+
+class NoisyRankOpponent:
+    """
+    Opponent model that ranks the best available players for their roster and then perturbs each rank with gaussian
+    noise, so that opponents reach for players now and then instead of always taking the top of the board.
+    """
+
+    def __init__(self, noise: float = 1.5, candidates: int = 8):
+        self.noise = noise
+        self.candidates = candidates
+
+    def choose(self, draft: Draft, rng: np.random.Generator) -> Player:
+        options = draft.pool.top(draft.current_roster(), self.candidates)
+        noisy_ranks = np.arange(len(options)) + rng.normal(0.0, self.noise, len(options))
+        return options[int(np.argmin(noisy_ranks))]
+
+
+class MonteCarloResult:
+
+    def __init__(self, store: PlayerStore, pick_numbers: list[int], availability: np.ndarray,
+                 candidates: list[int], candidate_totals: np.ndarray, candidate_drafts: np.ndarray, drafts: int,
+                 elapsed: float, pick_scores: np.ndarray = None, first_pick: int = 1):
+        self.store = store
+        self.pick_numbers = pick_numbers
+        self.availability = availability
+        self.pick_scores = pick_scores
+        self.first_pick = first_pick
+        self.candidates = candidates
+        self.candidate_totals = candidate_totals
+        self.candidate_drafts = candidate_drafts
+        self.drafts = drafts
+        self.elapsed = elapsed
+
+    @property
+    def drafts_per_second(self) -> float:
+        return self.drafts / self.elapsed if self.elapsed > 0 else float("inf")
+
+    def probability_available(self, player: Player) -> list[float]:
+        """
+        The probability the player is still available at each of my upcoming picks.
+        """
+        return list(self.availability[:, player.index])
+
+    def expected_pick_score(self, pick_number: int) -> float:
+        """
+        The expected season total of the player taken with the given overall pick, by whichever drafter holds it.
+        """
+        return float(self.pick_scores[pick_number - self.first_pick])
+
+    def expected_totals(self) -> dict[str, float]:
+        """
+        The expected best-ball season total of my roster for each candidate taken with my next pick. A candidate
+        that was gone by my pick in every draft has no expected total and is left out.
+        """
+        return {self.store.names[idx]: float(total / drafts)
+                for idx, total, drafts in zip(self.candidates, self.candidate_totals, self.candidate_drafts)
+                if drafts > 0}
+
+    def print_summary(self, top_count: int = 15) -> None:
+        from prettytable import PrettyTable
+
+        candidate_table = PrettyTable()
+        candidate_table.field_names = ["Candidate", "Expected Season Total", "Drafts"]
+        candidate_table.float_format = ".2"
+        expected = self.expected_totals()
+        for idx, drafts in zip(self.candidates, self.candidate_drafts):
+            if self.store.names[idx] in expected:
+                candidate_table.add_row([self.store.names[idx], expected[self.store.names[idx]], int(drafts)])
+
+        availability_table = PrettyTable()
+        availability_table.field_names = ["Name", "Position"] + ["Pick " + str(n) for n in self.pick_numbers]
+        availability_table.float_format = ".2"
+        still_available = self.availability[0] > 0.0 if len(self.pick_numbers) else np.zeros(0, dtype=bool)
+        ranked = [idx for idx in self.store.ranked() if still_available[idx]][:top_count]
+        for idx in ranked:
+            availability_table.add_row([self.store.names[idx], self.store.positions[idx]] +
+                                       list(self.availability[:, idx]))
+
+        print("Candidates:")
+        print(candidate_table)
+        print("")
+        print("Probability Available:")
+        print(availability_table)
+        print(f"{self.drafts} drafts in {self.elapsed:.2f}s ({self.drafts_per_second:.1f} drafts/second)")
+
+
+class MonteCarloSimulator:
+    """
+    Plays the rest of a draft many times over with stochastic opponents. My own picks are greedy apart from the
+    next one, which cycles through the best candidates so that the expected season total of each choice can be
+    compared. Drafts run across a process pool whose workers read the player projections from shared memory.
+    """
+
+    def __init__(self, draft: Draft, opponent_model=None, rounds: int = 16, candidates: int = 5,
+                 workers: int = None, seed: int = 0):
+        self.draft = draft
+        self.opponent_model = opponent_model if opponent_model is not None else NoisyRankOpponent()
+        self.rounds = rounds
+        self.workers = workers
+        self.seed = seed
+        self.store = next(iter(draft.pool)).store
+        my_roster = draft.rosters[draft.my_position]
+        self.candidates = [p.index for p in draft.pool.top(my_roster, candidates)]
+        drafted = sum(len(roster.all_players) for roster in draft.rosters)
+        self.remaining_picks = max(0, min(rounds * draft.total_drafters - drafted, len(draft.pool)))
+        self.pick_numbers = [drafted + pick + 1 for pick in range(self.remaining_picks)
+                             if (draft.current_position + pick) % draft.total_drafters == draft.my_position]
+
+    def state(self) -> dict:
+        return {"total_drafters": self.draft.total_drafters, "my_position": self.draft.my_position,
+                "current_position": self.draft.current_position,
+                "rosters": [[p.index for p in roster.all_players] for roster in self.draft.rosters],
+                "opponent_model": self.opponent_model, "candidates": self.candidates,
+                "remaining_picks": self.remaining_picks, "turns": len(self.pick_numbers)}
+
+    def run(self, drafts: int, batch_size: int = 50) -> MonteCarloResult:
+        start = time.perf_counter()
+        batches = [range(first, min(first + batch_size, drafts)) for first in range(0, drafts, batch_size)]
+        if self.workers == 0:
+            _init_worker(None, self._store_fields(), self.state())
+            results = [_run_batch(batch, self.seed) for batch in batches]
+        else:
+            results = self._run_pool(batches)
+
+        availability = np.zeros((len(self.pick_numbers), len(self.store)))
+        candidate_totals = np.zeros(len(self.candidates))
+        candidate_drafts = np.zeros(len(self.candidates))
+        pick_scores = np.zeros(self.remaining_picks)
+        for batch_availability, batch_totals, batch_drafts, batch_pick_scores in results:
+            availability += batch_availability
+            candidate_totals += batch_totals
+            candidate_drafts += batch_drafts
+            pick_scores += batch_pick_scores
+        drafted = sum(len(roster.all_players) for roster in self.draft.rosters)
+        return MonteCarloResult(self.store, self.pick_numbers, availability / max(drafts, 1), self.candidates,
+                                candidate_totals, candidate_drafts, drafts, time.perf_counter() - start,
+                                pick_scores / max(drafts, 1), drafted + 1)
+
+    def _store_fields(self) -> dict:
+        return {"names": self.store.names, "positions": list(self.store.positions), "teams": self.store.teams,
+                "weeks": self.store.weeks, "stats": self.store.stats, "played": self.store.played,
+                "weights": self.store.weights}
+
+    def _run_pool(self, batches: list[range]) -> list[tuple]:
+        fields = self._store_fields()
+        shared = {}
+        try:
+            for name in ["stats", "played"]:
+                array = np.ascontiguousarray(fields.pop(name))
+                block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+                np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+                shared[name] = (block, array.shape, array.dtype.str)
+            specs = {name: (block.name, shape, dtype) for name, (block, shape, dtype) in shared.items()}
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=(specs, fields, self.state())) as executor:
+                return list(executor.map(_run_batch, batches, [self.seed] * len(batches)))
+        finally:
+            for block, _, _ in shared.values():
+                block.close()
+                block.unlink()
+
+
+# Each worker process builds its draft once from the shared projections and resets it with Draft.undo.
+_worker = {}
+
+
+def _init_worker(specs: dict, fields: dict, state: dict) -> None:
+    fields = dict(fields)
+    for name, (block_name, shape, dtype) in (specs or {}).items():
+        block = shared_memory.SharedMemory(name=block_name)
+        _worker.setdefault("blocks", []).append(block)
+        fields[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+    store = PlayerStore(**fields)
+    players = [Player(store, idx) for idx in range(len(store))]
+    rosters = [Roster() for _ in range(state["total_drafters"])]
+    drafted = set()
+    for roster, indices in zip(rosters, state["rosters"]):
+        for idx in indices:
+            roster.add(players[idx])
+            drafted.add(idx)
+    _worker["draft"] = Draft(state["total_drafters"], state["my_position"],
+                             players=[p for p in players if p.index not in drafted], rosters=rosters,
+                             current_position=state["current_position"])
+    _worker["players"] = players
+    _worker["state"] = state
+
+
+def _run_batch(draft_numbers: range, seed: int) -> tuple:
+    draft = _worker["draft"]
+    players = _worker["players"]
+    state = _worker["state"]
+    candidates = state["candidates"]
+    availability = np.zeros((state["turns"], len(players)))
+    candidate_totals = np.zeros(len(candidates))
+    candidate_drafts = np.zeros(len(candidates))
+    pick_scores = np.zeros(state["remaining_picks"])
+    for draft_number in draft_numbers:
+        rng = np.random.default_rng([seed, draft_number])
+        candidate = players[candidates[draft_number % len(candidates)]] if candidates else None
+        candidate_taken = False
+        turn = 0
+        picks = 0
+        for _ in range(state["remaining_picks"]):
+            if draft.current_position == draft.my_position:
+                availability[turn, [p.index for p in draft.pool]] += 1
+                if turn == 0 and candidate is not None and candidate in draft.pool:
+                    player = candidate
+                    candidate_taken = True
+                else:
+                    player = draft.next_best_available()
+                turn += 1
+            else:
+                player = state["opponent_model"].choose(draft, rng)
+            draft.pick(player)
+            pick_scores[picks] += player.store.totals[player.index]
+            picks += 1
+        if candidate_taken:
+            slot = draft_number % len(candidates)
+            candidate_totals[slot] += draft.rosters[draft.my_position].best_ball_total()
+            candidate_drafts[slot] += 1
+        for _ in range(picks):
+            draft.undo()
+    return availability, candidate_totals, candidate_drafts, pick_scores
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo forecast of the rest of the draft.")
+    parser.add_argument("--drafts", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rounds", type=int, default=16)
+    parser.add_argument("--noise", type=float, default=1.5)
+    args = parser.parse_args()
+    # Forecasts the rest of the draft in progress.
+    draft = Draft(12, my_position=4, journal=PickJournal(Constants.PICK_JOURNAL_FILENAME,
+                                                         Constants.PICK_SNAPSHOT_FILENAME))
+    simulator = MonteCarloSimulator(draft, NoisyRankOpponent(noise=args.noise), rounds=args.rounds,
+                                    workers=args.workers, seed=args.seed)
+    simulator.run(args.drafts).print_summary()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+import bisect
+import re
+import unicodedata
+
+import numpy as np
+
+
+class NameIndex:
+    """
+    Typeahead index over the names of every player of a store, a row per store index. Names are normalized (accents,
+    case, punctuation and generational suffixes are dropped, so "D'Andre Swift", "dandre swift" and "D'Andre Swift
+    Jr." all share one key) and indexed twice: by trigram, as posting arrays of rows, for ranked fuzzy matching and as
+    a sorted list of keys and name words for prefix completion.
+
+    The index is built once per store and shared by every pool drafting from it. Each lookup takes the pool's
+    availability mask over the store, so it only returns players who are still available and drafting or undoing a
+    pick never touches the index.
+    """
+
+    SUFFIXES = {"jr", "sr", "ii", "iii", "iv", "v"}
+    COMMON_SHARE = 0.05
+
+    @classmethod
+    def of(cls, store):
+        """
+        The index of the store's names, built the first time it is asked for and kept on the store.
+        """
+        if store.name_index is None:
+            store.name_index = cls(store.names, store.totals)
+        return store.name_index
+
+    def __init__(self, names: list[str], scores: np.ndarray = None):
+        self.keys = [self.normalize(name) for name in names]
+        self.scores = np.asarray(scores, dtype=float) if scores is not None else np.zeros(len(self.keys))
+
+        self.exact = {}
+        postings = {}
+        gram_counts = []
+        prefixes = []
+        for row, key in enumerate(self.keys):
+            self.exact.setdefault(key, []).append(row)
+            grams = self.grams(key)
+            gram_counts.append(len(grams))
+            for gram in grams:
+                postings.setdefault(gram, []).append(row)
+            prefixes.extend((word, row) for word in {key, *key.split(" ")})
+        self.gram_counts = np.array(gram_counts, dtype=float)
+        # Grams shared by a large part of the pool ("ler", " jo") would make every lookup touch most of it, so they
+        # are kept as columns of a dense matrix and only counted for the candidates the rarer grams find.
+        common = {gram: rows for gram, rows in postings.items() if len(rows) > self.COMMON_SHARE * len(self.keys)}
+        self.postings = {gram: np.array(rows, dtype=np.int64) for gram, rows in postings.items() if gram not in common}
+        self.common_columns = {gram: column for column, gram in enumerate(common)}
+        self.common = np.zeros((len(common), len(self.keys)), dtype=np.uint8)
+        for gram, rows in common.items():
+            self.common[self.common_columns[gram], rows] = 1
+        prefixes.sort()
+        self.prefix_words = [word for word, _ in prefixes]
+        self.prefix_rows = np.array([row for _, row in prefixes], dtype=np.int64)
+
+    @classmethod
+    def normalize(cls, name: str) -> str:
+        name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode().lower()
+        name = re.sub(r"[.'`]", "", name)
+        words = [word for word in re.split(r"[^a-z0-9]+", name) if word]
+        while len(words) > 1 and words[-1] in cls.SUFFIXES:
+            words.pop()
+        return " ".join(words)
+
+    @staticmethod
+    def grams(key: str) -> set[str]:
+        padded = "  " + key + " "
+        return {padded[idx:idx + 3] for idx in range(len(padded) - 2)}
+
+    def best(self, rows: np.ndarray, similarities: np.ndarray, limit: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Orders the rows by similarity then score, best first, partially selecting the top `limit` first when there
+        are many of them.
+        """
+        if len(rows) > limit:
+            kth = np.partition(-similarities, limit - 1)[limit - 1]
+            above = np.flatnonzero(-similarities < kth)
+            tied = np.flatnonzero(-similarities == kth)
+            room = limit - len(above)
+            if len(tied) > room:
+                # Break the ties at the cut by score, the same way, so a prefix every name shares stays cheap.
+                tied_scores = -self.scores[rows[tied]]
+                tied = tied[tied_scores <= np.partition(tied_scores, room - 1)[room - 1]]
+            keep = np.concatenate((above, tied))
+            rows, similarities = rows[keep], similarities[keep]
+        order = np.lexsort((rows, -self.scores[rows], -similarities))[:limit]
+        return rows[order], similarities[order]
+
+    def complete(self, prefix: str, available: np.ndarray, limit: int = 10) -> list[int]:
+        """
+        Returns the store indices of the available players whose name, or any word of it, starts with the prefix,
+        best players first.
+        """
+        prefix = self.normalize(prefix)
+        if not prefix:
+            return []
+        start = bisect.bisect_left(self.prefix_words, prefix)
+        end = bisect.bisect_left(self.prefix_words, prefix + "\x7f", start)
+        rows = np.sort(self.prefix_rows[start:end])
+        rows = rows[np.diff(rows, prepend=-1) != 0]
+        rows = rows[available[rows]]
+        rows, _ = self.best(rows, np.zeros(len(rows)), limit)
+        return rows.tolist()
+
+    def search(self, query: str, available: np.ndarray, limit: int = 5) -> list[tuple]:
+        """
+        Ranks the available players by how closely their name matches the query, returning (store index,
+        similarity) pairs, best first. Similarity is the Dice coefficient of the name trigrams, 1.0 for an identical
+        name once normalized, and ties go to the better player.
+        """
+        key = self.normalize(query)
+        if not key:
+            return []
+        exact = [row for row in self.exact.get(key, []) if available[row]]
+        if exact:
+            return [(row, 1.0) for row in sorted(exact, key=lambda row: -self.scores[row])]
+
+        query_grams = self.grams(key)
+        postings = [self.postings[gram] for gram in query_grams if gram in self.postings]
+        columns = [self.common_columns[gram] for gram in query_grams if gram in self.common_columns]
+        if postings:
+            shared = np.bincount(np.concatenate(postings), minlength=len(self.keys))
+            rows = np.flatnonzero((shared > 0) & available)
+            shared = shared[rows]
+        elif columns:
+            # Only common grams, so any available player may match.
+            rows = np.flatnonzero(available)
+            shared = np.zeros(len(rows), dtype=np.int64)
+        else:
+            return []
+        if columns:
+            shared = shared + self.common[columns][:, rows].sum(axis=0)
+        similarities = 2.0 * shared / (len(query_grams) + self.gram_counts[rows])
+        rows, similarities = self.best(rows, similarities, limit)
+        return [(row, float(similarity)) for row, similarity in zip(rows.tolist(), similarities)]
@@ -0,0 +1,92 @@
+import json
+import os
+
+from instrumentation import instrumented
+
+
+class PickJournal:
+    """
+    Append-only record of the picks made in a draft. Every pick, and every undone pick, is appended as one json line
+    and fsync'd before the draft moves on, so a crash loses nothing. The journal is replayed against the projections
+    on startup and is compacted into a snapshot of the picks now and again so that replay stays short.
+
+    Each record carries the number of the pick it makes or undoes and applying a record truncates the picks to that
+    number first. Replaying a record twice is therefore harmless, which keeps recovery exact even if a crash lands
+    between writing a snapshot and truncating the journal.
+    """
+
+    COMPACT_EVERY = 50
+
+    def __init__(self, filename: str, snapshot_filename: str):
+        self.filename = filename
+        self.snapshot_filename = snapshot_filename
+        self.records = 0
+
+    def picks(self) -> list[tuple[int, str]]:
+        """
+        Returns the (drafter slot, player name) of every pick that has not been undone, in the order made.
+        """
+        picks = []
+        try:
+            with open(self.snapshot_filename, 'r') as snapshot_file:
+                picks = [(slot, player_name) for slot, player_name in json.load(snapshot_file)["picks"]]
+        except FileNotFoundError:
+            pass
+
+        self.records = 0
+        try:
+            with open(self.filename, 'rb') as journal_file:
+                lines = journal_file.readlines()
+        except FileNotFoundError:
+            return picks
+        offset = 0
+        for line_number, line in enumerate(lines):
+            try:
+                if not line.endswith(b"\n"):
+                    raise ValueError("Unterminated record")
+                record = json.loads(line)
+            except ValueError:
+                # Only the last line can be torn by a crash mid-write, drop it so the next append starts cleanly.
+                if line_number == len(lines) - 1:
+                    os.truncate(self.filename, offset)
+                    break
+                raise
+            offset += len(line)
+            self.records += 1
+            if "undo" in record:
+                picks = picks[:record["undo"] - 1]
+            else:
+                picks = picks[:record["pick"] - 1] + [(record["slot"], record["player"])]
+        return picks
+
+    def append(self, pick_number: int, slot: int, player_name: str) -> None:
+        self.write({"pick": pick_number, "slot": slot, "player": player_name})
+
+    def undo(self, pick_number: int) -> None:
+        self.write({"undo": pick_number})
+
+    @instrumented
+    def write(self, record: dict) -> None:
+        with open(self.filename, 'a') as journal_file:
+            journal_file.write(json.dumps(record) + "\n")
+            journal_file.flush()
+            os.fsync(journal_file.fileno())
+        self.records += 1
+
+    @instrumented
+    def compact(self, picks: list[tuple[int, str]]) -> None:
+        with open(self.snapshot_filename + '.tmp', 'w') as snapshot_file:
+            json.dump({"picks": picks}, snapshot_file)
+            snapshot_file.flush()
+            os.fsync(snapshot_file.fileno())
+        os.replace(self.snapshot_filename + '.tmp', self.snapshot_filename)
+        with open(self.filename, 'w') as journal_file:
+            os.fsync(journal_file.fileno())
+        self.records = 0
+
+    def clear(self) -> None:
+        for filename in [self.filename, self.snapshot_filename]:
+            try:
+                os.remove(filename)
+            except FileNotFoundError:
+                pass
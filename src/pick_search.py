@@ -0,0 +1,90 @@
+import time
+
+import numpy as np
+
+from models import Draft, Player
+from instrumentation import instrumented
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class SearchResult:
+
+    def __init__(self, player: Player, projected_total: float, depth: int, nodes: int, elapsed: float):
+        self.player = player
+        self.projected_total = projected_total
+        self.depth = depth
+        self.nodes = nodes
+        self.elapsed = elapsed
+
+
+class PickSearch:
+    """
+    Looks ahead over the current roster's next picks rather than taking the best net additional score. At each of
+    the roster's turns the best `width` players are tried, the opponents between turns are predicted to take their
+    next best available player, and the pick leading to the best best-ball season total is recommended.
+
+    Positions are identified by the draft's board key, which hashes which drafter took which player, so
+    transpositions of the same picks are only searched once. Depth is increased one pick at a time until the time budget runs out and the
+    answer of the deepest completed search is returned.
+    """
+
+    def __init__(self, draft: Draft, width: int = 4):
+        self.draft = draft
+        self.width = width
+        self.transpositions = {}
+        self.nodes = 0
+
+    @instrumented
+    def search(self, max_depth: int = 4, time_budget: float = 2.0):
+        start = time.perf_counter()
+        deadline = start + time_budget
+        slot = self.draft.current_position
+        best = None
+        self.nodes = 0
+        for depth in range(1, max_depth + 1):
+            try:
+                value, player = self.best_pick(slot, depth, deadline)
+            except SearchTimeout:
+                break
+            if player is None:
+                break
+            best = SearchResult(player, value, depth, self.nodes, time.perf_counter() - start)
+        return best
+
+    def best_pick(self, slot: int, depth: int, deadline: float) -> tuple:
+        key = (self.draft.board_key(), depth)
+        if key in self.transpositions:
+            return self.transpositions[key]
+        if time.perf_counter() > deadline:
+            raise SearchTimeout()
+
+        self.nodes += 1
+        best_value, best_player = -np.inf, None
+        for candidate in self.draft.pool.top(self.draft.current_roster(), self.width):
+            self.draft.pick(candidate)
+            opponent_picks = 0
+            try:
+                if depth > 1:
+                    opponent_picks = self.predict_opponents(slot)
+                if depth > 1 and self.draft.current_position == slot and len(self.draft.pool) > 0:
+                    value, _ = self.best_pick(slot, depth - 1, deadline)
+                else:
+                    value = self.draft.rosters[slot].best_ball_total()
+            finally:
+                for _ in range(opponent_picks + 1):
+                    self.draft.undo()
+            if value > best_value:
+                best_value, best_player = value, candidate
+
+        self.transpositions[key] = (best_value, best_player)
+        return best_value, best_player
+
+    def predict_opponents(self, slot: int) -> int:
+        picks = 0
+        while self.draft.current_position != slot and len(self.draft.pool) > 0:
+            self.draft.pick(self.draft.next_best_available())
+            picks += 1
+        return picks
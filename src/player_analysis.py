@@ -1,13 +1,30 @@
+import argparse
+
+import numpy as np
+
+from constants import Constants
 from models import Player
-from prettytable import PrettyTable
+from scoring import ScoringConfig
 
 
 def main():
-    players = list(sorted(Player.load().values(), key=lambda p: p.overall_score(), reverse=True))
+    parser = argparse.ArgumentParser(description="Ranks every player by projected season total.")
+    parser.add_argument("--scoring", nargs="*", help="scoring rules to score under, ranked by the first, or 'all'")
+    args = parser.parse_args()
+
+    config = ScoringConfig.load(Constants.SCORING_RULES_FILENAME)
+    names = [config.default] if not args.scoring else list(config.rule_sets) if args.scoring == ["all"] else args.scoring
+    players = list(Player.load(config.get(names[0])).values())
+    store = players[0].store
+    totals = config.season_totals(store, names)
+    from prettytable import PrettyTable
     player_table = PrettyTable()
-    player_table.field_names = ["Name", "Overall Score", "Rank"]
-    for idx, player in enumerate(players):
-        player_table.add_row([player.name, player.overall_score(), idx])
+    if len(names) == 1:
+        player_table.field_names = ["Name", "Overall Score", "Rank"]
+    else:
+        player_table.field_names = ["Name"] + ["Overall Score (" + name + ")" for name in names] + ["Rank"]
+    for idx, player_index in enumerate(np.argsort(-totals[:, 0], kind="stable")):
+        player_table.add_row([store.names[player_index], *totals[player_index].tolist(), idx])
     print(player_table)
 
 
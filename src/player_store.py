@@ -0,0 +1,356 @@
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+
+from instrumentation import instrumented
+
+
+class PlayerStore:
+    """
+    Columnar storage for every player's projected stats. Stats are held as a players x weeks x stat categories
+    array alongside a precomputed players x weeks points matrix so that season totals, weekly scores and rankings
+    are array operations rather than per-object recomputation. The store is immutable once built and is shared by
+    every Player view (and every copy of a draft) that references it. Points are scored with a weight vector over
+    the stat categories, the built in SCORING_WEIGHTS unless a store is rescored under other scoring rules.
+    """
+
+    STAT_CATEGORIES = ["passing_yards", "passing_td", "interceptions", "rushing_yards", "rushing_td",
+                       "receiving_yards", "receiving_td", "fumbles", "receptions"]
+    SCORING_WEIGHTS = np.array([1 / 50, 3, -1, 1 / 30, 3, 1 / 30, 3, -1, 0])
+
+    # Bump whenever the layout of a saved bundle changes so that stale bundles are rejected rather than misread.
+    FORMAT_VERSION = 2
+    FORMAT_NAME = "fantasy-football-drafter/player-store"
+
+    # Maps a stat category to the key it is stored under in the projected player stats json.
+    JSON_KEYS = {"passing_yards": "passing_yards", "passing_td": "passing_tds", "interceptions": "interceptions",
+                 "rushing_yards": "rushing_yards", "rushing_td": "rushing_tds", "receiving_yards": "receiving_yards",
+                 "receiving_td": "receiving_tds", "fumbles": "fumbles", "receptions": "receptions"}
+
+    def __init__(self, names: list[str], positions: list[str], teams: list[str], weeks: list[str],
+                 stats: np.ndarray, played: np.ndarray, points: np.ndarray = None, path: str = None,
+                 weights: np.ndarray = None):
+        self.names = names
+        self.positions = np.array(positions)
+        self.teams = teams
+        self.weeks = weeks
+        self.week_index = {week: idx for idx, week in enumerate(weeks)}
+        self.stats = stats
+        self.played = played
+        self.weights = np.asarray(weights if weights is not None else self.SCORING_WEIGHTS, dtype=float)
+        self.points = points if points is not None else np.where(played, stats @ self.weights, 0.0)
+        self.totals = self.points.sum(axis=1)
+        self.path = path
+        # Orderings are computed once per store, or read precomputed from a snapshot.
+        self.rankings = {}
+        self.ranks = None
+        # The typeahead index of the names, see NameIndex.of.
+        self.name_index = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        # A store opened from a bundle pickles as a reference to the bundle rather than a copy of its arrays.
+        if self.path is not None:
+            return PlayerStore.reopen, (self.path, self.weights.tolist())
+        return PlayerStore, (self.names, list(self.positions), self.teams, self.weeks, self.stats, self.played,
+                             self.points, None, self.weights)
+
+    def rescored(self, weights: np.ndarray):
+        """
+        Returns a store over the same stats scored with other weights, computing every player week's points in one
+        matrix product.
+        """
+        return PlayerStore(self.names, list(self.positions), self.teams, self.weeks, self.stats, self.played,
+                           path=self.path, weights=weights)
+
+    @classmethod
+    def reopen(cls, path: str, weights: list[float]):
+        store = cls.from_bundle(path)
+        if np.array_equal(store.weights, weights):
+            return store
+        key = (*cls.bundle_key(path), tuple(weights))
+        if key not in _open_bundles:
+            _open_bundles[key] = store.rescored(np.array(weights))
+        return _open_bundles[key]
+
+    def category_index(self, category: str) -> int:
+        return self.STAT_CATEGORIES.index(category)
+
+    def starter_scores(self, indices) -> np.ndarray:
+        """
+        Returns the weekly points of the given players, weeks they are not projected to play are -inf so that they
+        can never count as a starter.
+        """
+        return np.where(self.played[indices], self.points[indices], -np.inf)
+
+    def ranked(self, position: str = None) -> np.ndarray:
+        """
+        Returns player indices ordered by season total, best first, optionally limited to a single position.
+        """
+        if position not in self.rankings:
+            indices = np.arange(len(self)) if position is None else np.flatnonzero(self.positions == position)
+            self.rankings[position] = indices[np.argsort(-self.totals[indices], kind="stable")]
+        return self.rankings[position]
+
+    def position_ranks(self) -> np.ndarray:
+        """
+        Returns the 1-based rank of every player within their own position by season total.
+        """
+        if self.ranks is None:
+            ranks = np.zeros(len(self), dtype=np.int64)
+            for position in np.unique(self.positions):
+                ordered = self.ranked(position)
+                ranks[ordered] = np.arange(1, len(ordered) + 1)
+            self.ranks = ranks
+        return self.ranks
+
+    def freeze(self):
+        """
+        Computes every ordering up front and marks the arrays read-only, so that one store can be shared by drafts
+        running on many threads without any of them writing to it.
+        """
+        for position in [None, *np.unique(self.positions).tolist()]:
+            self.ranked(position)
+        self.position_ranks()
+        for array in [self.positions, self.stats, self.played, self.points, self.totals, self.ranks,
+                      *self.rankings.values()]:
+            array.flags.writeable = False
+        return self
+
+    @staticmethod
+    def parse(value: str) -> float:
+        try:
+            return float(value)
+        except ValueError:
+            return 0.0
+
+    @classmethod
+    @instrumented
+    def from_json(cls, filename: str):
+        with open(filename, 'r') as player_stats_file:
+            player_stats = json.load(player_stats_file)
+
+        weeks = list(player_stats.keys())
+        player_index = {}
+        names, positions, teams = [], [], []
+        for stats in player_stats.values():
+            for stat in stats:
+                if stat['player_name'] not in player_index:
+                    player_index[stat['player_name']] = len(names)
+                    names.append(stat['player_name'])
+                    positions.append(stat['player_position'])
+                    teams.append(stat['player_team'])
+
+        values = np.zeros((len(names), len(weeks), len(cls.STAT_CATEGORIES)))
+        played = np.zeros((len(names), len(weeks)), dtype=bool)
+        json_keys = [cls.JSON_KEYS[category] for category in cls.STAT_CATEGORIES]
+        for week_idx, stats in enumerate(player_stats.values()):
+            for stat in stats:
+                idx = player_index[stat['player_name']]
+                played[idx, week_idx] = True
+                # Projections crawled before a category was added simply have none of it.
+                values[idx, week_idx] = [cls.parse(stat.get(key, "-")) for key in json_keys]
+        return cls(names, positions, teams, weeks, values, played)
+
+    def to_json(self, filename: str) -> None:
+        player_stats = {}
+        for week_idx, week in enumerate(self.weeks):
+            player_stats[week] = [
+                {"player_name": self.names[idx], "player_position": str(self.positions[idx]),
+                 "player_team": self.teams[idx],
+                 **{self.JSON_KEYS[category]: str(float(self.stats[idx, week_idx, category_idx]))
+                    for category_idx, category in enumerate(self.STAT_CATEGORIES)}}
+                for idx in np.flatnonzero(self.played[:, week_idx])]
+        with open(filename, 'w') as player_stats_file:
+            json.dump(player_stats, player_stats_file)
+
+    def save(self, path: str) -> None:
+        """
+        Writes the store as a bundle directory: one .npy file per array, a string table for names, positions and
+        teams, and a manifest which is written last so that a partially written bundle is never opened.
+        """
+        os.makedirs(path, exist_ok=True)
+        _forget_bundle(path)
+        strings = list(dict.fromkeys([*self.names, *self.positions, *self.teams]))
+        string_index = {value: idx for idx, value in enumerate(strings)}
+        players = np.zeros(len(self), dtype=[("name", "<i4"), ("position", "<i4"), ("team", "<i4")])
+        players["name"] = [string_index[name] for name in self.names]
+        players["position"] = [string_index[position] for position in self.positions]
+        players["team"] = [string_index[team] for team in self.teams]
+
+        np.save(os.path.join(path, "players.npy"), players)
+        np.save(os.path.join(path, "stats.npy"), np.ascontiguousarray(self.stats, dtype="<f8"))
+        np.save(os.path.join(path, "played.npy"), np.ascontiguousarray(self.played, dtype=bool))
+        np.save(os.path.join(path, "points.npy"), np.ascontiguousarray(self.points, dtype="<f8"))
+        np.save(os.path.join(path, "ranked.npy"), self.ranked().astype("<i8"))
+        np.save(os.path.join(path, "position_ranks.npy"), self.position_ranks().astype("<i8"))
+        with open(os.path.join(path, "strings.json"), 'w') as strings_file:
+            json.dump(strings, strings_file)
+        manifest = {"format": self.FORMAT_NAME, "version": self.FORMAT_VERSION, "players": len(self),
+                    "weeks": self.weeks, "categories": self.STAT_CATEGORIES, "weights": self.weights.tolist()}
+        with open(os.path.join(path, "manifest.json.tmp"), 'w') as manifest_file:
+            json.dump(manifest, manifest_file)
+        os.replace(os.path.join(path, "manifest.json.tmp"), os.path.join(path, "manifest.json"))
+
+    @classmethod
+    @instrumented
+    def from_bundle(cls, path: str):
+        """
+        Opens a bundle written by save. The stat arrays are memory-mapped rather than read, so opening a bundle costs
+        little more than decoding its string table.
+        """
+        path = os.path.abspath(path)
+        key = cls.bundle_key(path)
+        if key in _open_bundles:
+            return _open_bundles[key]
+        # The bundle was rewritten since it was last opened, the stores of its old contents are not handed out again.
+        _forget_bundle(path)
+        with open(os.path.join(path, "manifest.json"), 'r') as manifest_file:
+            manifest = json.load(manifest_file)
+        if manifest.get("format") != cls.FORMAT_NAME or manifest.get("version") != cls.FORMAT_VERSION:
+            raise ValueError("Unsupported player store bundle " + path + ": " + str(manifest.get("format")) +
+                             " version " + str(manifest.get("version")))
+        if manifest["categories"] != cls.STAT_CATEGORIES:
+            raise ValueError("Player store bundle " + path + " has different stat categories")
+
+        with open(os.path.join(path, "strings.json"), 'r') as strings_file:
+            strings = json.load(strings_file)
+        players = np.load(os.path.join(path, "players.npy"))
+        store = cls([strings[idx] for idx in players["name"]], [strings[idx] for idx in players["position"]],
+                    [strings[idx] for idx in players["team"]], manifest["weeks"],
+                    np.load(os.path.join(path, "stats.npy"), mmap_mode='r'),
+                    np.load(os.path.join(path, "played.npy"), mmap_mode='r'),
+                    np.load(os.path.join(path, "points.npy"), mmap_mode='r'), path, np.array(manifest["weights"]))
+        if os.path.exists(os.path.join(path, "ranked.npy")):
+            store.rankings[None] = np.load(os.path.join(path, "ranked.npy"), mmap_mode='r')
+            store.ranks = np.load(os.path.join(path, "position_ranks.npy"), mmap_mode='r')
+        _open_bundles[key] = store
+        return store
+
+    @staticmethod
+    def bundle_key(path: str) -> tuple:
+        """
+        Identifies one writing of a bundle by its path and its manifest's modification time and size. The manifest is
+        replaced last whenever a bundle is saved, so rewriting a bundle changes its key.
+        """
+        stat = os.stat(os.path.join(path, "manifest.json"))
+        return os.path.abspath(path), stat.st_mtime_ns, stat.st_size
+
+    @classmethod
+    def load(cls, json_filename: str, bundle_path: str, weights: np.ndarray = None, snapshot_dir: str = None):
+        """
+        Opens the bundle if it is at least as new as the json it was converted from, otherwise parses the json. A
+        bundle written in an older format is passed over for the json too. The store is scored with the given
+        weights, the built in weights if none are given.
+
+        Given a snapshot directory, the scored store is cached there as a snapshot bundle, with its orderings
+        precomputed, named for a hash of the json's content and the weights. Later loads of the same projections
+        under the same scoring open the snapshot instead, and changing either builds a new one.
+        """
+        if snapshot_dir is not None and os.path.exists(json_filename):
+            snapshot_key = cls.snapshot_key(json_filename, weights, snapshot_dir)
+            snapshot_path = os.path.join(snapshot_dir, snapshot_key + ".bundle")
+            if os.path.exists(os.path.join(snapshot_path, "manifest.json")):
+                os.utime(snapshot_path)
+            else:
+                cls.load(json_filename, bundle_path, weights).save_snapshot(snapshot_path)
+            return cls.from_bundle(snapshot_path)
+
+        bundle_manifest = os.path.join(bundle_path, "manifest.json")
+        store = None
+        if os.path.exists(bundle_manifest) and (not os.path.exists(json_filename) or
+                                                os.path.getmtime(bundle_manifest) >= os.path.getmtime(json_filename)):
+            try:
+                store = cls.from_bundle(bundle_path)
+            except ValueError:
+                if not os.path.exists(json_filename):
+                    raise
+        if store is None:
+            store = cls.from_json(json_filename)
+        if weights is not None and not np.array_equal(store.weights, weights):
+            store = store.rescored(weights)
+        return store
+
+    @classmethod
+    def snapshot_key(cls, json_filename: str, weights: np.ndarray = None, snapshot_dir: str = None) -> str:
+        digest = hashlib.sha256()
+        digest.update(json.dumps([cls.FORMAT_NAME, cls.FORMAT_VERSION, cls.STAT_CATEGORIES]).encode())
+        digest.update(np.asarray(weights if weights is not None else cls.SCORING_WEIGHTS, dtype="<f8").tobytes())
+        digest.update(cls.content_hash(json_filename, snapshot_dir).encode())
+        return digest.hexdigest()[:32]
+
+    @staticmethod
+    def content_hash(filename: str, snapshot_dir: str = None) -> str:
+        """
+        The sha256 of the file. The hash is remembered in the snapshot directory along with the file's size and
+        modification time, so an unchanged file is not read again just to hash it.
+        """
+        stat = os.stat(filename)
+        signature = [os.path.abspath(filename), stat.st_size, stat.st_mtime_ns]
+        hashes_filename = os.path.join(snapshot_dir, "content_hashes.json") if snapshot_dir is not None else None
+        hashes = []
+        if hashes_filename is not None:
+            try:
+                with open(hashes_filename, 'r') as hashes_file:
+                    hashes = json.load(hashes_file)
+            except (OSError, ValueError):
+                pass
+            for remembered_signature, remembered_hash in hashes:
+                if remembered_signature == signature:
+                    return remembered_hash
+
+        digest = hashlib.sha256()
+        with open(filename, 'rb') as hashed_file:
+            for chunk in iter(lambda: hashed_file.read(1 << 20), b""):
+                digest.update(chunk)
+        if hashes_filename is not None:
+            hashes = [entry for entry in hashes if entry[0][0] != signature[0]] + [[signature, digest.hexdigest()]]
+            os.makedirs(snapshot_dir, exist_ok=True)
+            with open(hashes_filename + "." + str(os.getpid()) + ".tmp", 'w') as hashes_file:
+                json.dump(hashes, hashes_file)
+            os.replace(hashes_filename + "." + str(os.getpid()) + ".tmp", hashes_filename)
+        return digest.hexdigest()
+
+    def save_snapshot(self, path: str, keep: int = 4) -> None:
+        """
+        Saves the store as a snapshot bundle and removes all but the `keep` most recently used snapshots beside it.
+        The bundle is written under a temporary name and renamed into place, so a snapshot is never seen half
+        written, even by another process building the same one.
+        """
+        snapshot_dir = os.path.dirname(path)
+        temporary_path = path + "." + str(os.getpid()) + ".tmp"
+        self.save(temporary_path)
+        _forget_bundle(path)
+        try:
+            os.rename(temporary_path, path)
+        except OSError:
+            shutil.rmtree(temporary_path, ignore_errors=True)
+        last_used = {}
+        for name in os.listdir(snapshot_dir):
+            try:
+                if name.endswith(".bundle"):
+                    last_used[os.path.join(snapshot_dir, name)] = os.path.getmtime(os.path.join(snapshot_dir, name))
+            except OSError:
+                pass
+        for stale in sorted(last_used, key=last_used.get, reverse=True)[keep:]:
+            if stale != path:
+                shutil.rmtree(stale, ignore_errors=True)
+
+
+# Bundles already opened in this process, so that every pickled reference to a bundle shares one store. Keyed by
+# PlayerStore.bundle_key, followed by the weights for a store rescored from the bundle.
+_open_bundles = {}
+
+
+def _forget_bundle(path: str) -> None:
+    path = os.path.abspath(path)
+    for key in [key for key in _open_bundles if key[0] == path]:
+        del _open_bundles[key]
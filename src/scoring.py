@@ -0,0 +1,95 @@
+import json
+
+import numpy as np
+
+from player_store import PlayerStore
+
+
+class ScoringRules:
+    """
+    A league's scoring system compiled into a weight vector over the store's stat categories, so that scoring every
+    player week is a single matrix product with the stats array.
+    """
+
+    def __init__(self, name: str, points: dict[str, float]):
+        unknown = set(points) - set(PlayerStore.STAT_CATEGORIES)
+        if unknown:
+            raise ValueError("Scoring rules " + name + " score unknown stat categories: " + ", ".join(sorted(unknown)))
+        self.name = name
+        self.points = points
+        self.weights = np.array([float(points.get(category, 0.0)) for category in PlayerStore.STAT_CATEGORIES])
+
+    def __repr__(self):
+        return "ScoringRules(" + self.name + ")"
+
+
+class ScoringConfig:
+    """
+    Every rule set declared in a scoring rules file. Each rule set gives the points scored per unit of a stat
+    category, for example 0.04 per passing yard or 1 per reception, and may extend another rule set and override
+    some of its points:
+
+        {"default": "standard",
+         "rule_sets": {"standard": {"passing_yards": 0.04, "passing_td": 4, ...},
+                       "ppr": {"extends": "standard", "receptions": 1}}}
+    """
+
+    def __init__(self, rule_sets: dict[str, ScoringRules], default: str):
+        if default not in rule_sets:
+            raise ValueError("Default scoring rules " + default + " are not declared")
+        self.rule_sets = rule_sets
+        self.default = default
+
+    @classmethod
+    def from_dict(cls, config: dict):
+        declared = config["rule_sets"]
+        compiled = {}
+
+        def compile_rules(name: str, extending: tuple) -> dict:
+            if name not in declared:
+                raise ValueError("Scoring rules " + name + " are not declared")
+            if name in extending:
+                raise ValueError("Scoring rules " + name + " extend themselves")
+            points = dict(declared[name])
+            parent = points.pop("extends", None)
+            return {**(compile_rules(parent, extending + (name,)) if parent else {}), **points}
+
+        for name in declared:
+            compiled[name] = ScoringRules(name, compile_rules(name, ()))
+        return cls(compiled, config.get("default", next(iter(compiled))))
+
+    @classmethod
+    def load(cls, filename: str):
+        """
+        Reads the scoring rules file, or falls back to the store's built in scoring if there is no file.
+        """
+        try:
+            with open(filename, 'r') as config_file:
+                return cls.from_dict(json.load(config_file))
+        except FileNotFoundError:
+            standard = dict(zip(PlayerStore.STAT_CATEGORIES, PlayerStore.SCORING_WEIGHTS.tolist()))
+            return cls({"standard": ScoringRules("standard", standard)}, "standard")
+
+    def get(self, name: str = None) -> ScoringRules:
+        name = name or self.default
+        if name not in self.rule_sets:
+            raise ValueError("Unknown scoring rules " + name + ", choose from " + ", ".join(self.rule_sets))
+        return self.rule_sets[name]
+
+    def weight_matrix(self, names: list[str] = None) -> np.ndarray:
+        """
+        Stacks the weight vectors of the named rule sets (all of them by default) into a categories x rule sets
+        matrix.
+        """
+        names = names if names is not None else list(self.rule_sets)
+        return np.stack([self.get(name).weights for name in names], axis=1)
+
+    def season_totals(self, store: PlayerStore, names: list[str] = None) -> np.ndarray:
+        """
+        Scores the whole pool under many rule sets at once, returning a players x rule sets matrix of season totals.
+        """
+        weights = self.weight_matrix(names)
+        # Summing the stats over the weeks played first makes this one (players x categories) @ (categories x rule
+        # sets) product, which is the same as scoring each week and adding them up.
+        season_stats = np.where(store.played[:, :, None], store.stats, 0.0).sum(axis=1)
+        return season_stats @ weights
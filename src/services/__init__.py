@@ -1,8 +1,8 @@
-from data_crawler import DataCrawler
+from async_crawler import AsyncDataCrawler
 
 
 def main():
-    crawler = DataCrawler()
+    crawler = AsyncDataCrawler()
     crawler.crawl_project_stats()
 
 
@@ -0,0 +1,156 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+
+from data_crawler import DataCrawler
+
+
+class TokenBucket:
+    """
+    Allows `rate` requests a second on average with bursts of up to `capacity` requests.
+    """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self.tokens) / self.rate)
+
+
+class HttpCache:
+    """
+    On-disk cache of HTTP responses keyed by url. Each entry keeps the body and the ETag and Last-Modified
+    validators it was served with so the next request for the url can be revalidated rather than downloaded again.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def filename(self, url: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(url.encode()).hexdigest())
+
+    def get(self, url: str):
+        try:
+            with open(self.filename(url) + '.json', 'r') as meta_file:
+                meta = json.load(meta_file)
+            with open(self.filename(url) + '.body', 'r', encoding='utf-8') as body_file:
+                return body_file.read(), meta
+        except (OSError, ValueError):
+            return None
+
+    def validators(self, url: str) -> dict:
+        cached = self.get(url)
+        if cached is None:
+            return {}
+        headers = {}
+        if cached[1].get('etag'):
+            headers['If-None-Match'] = cached[1]['etag']
+        if cached[1].get('last_modified'):
+            headers['If-Modified-Since'] = cached[1]['last_modified']
+        return headers
+
+    def put(self, url: str, body: str, headers) -> None:
+        with open(self.filename(url) + '.body', 'w', encoding='utf-8') as body_file:
+            body_file.write(body)
+        meta = {'url': url, 'etag': headers.get('ETag'), 'last_modified': headers.get('Last-Modified')}
+        with open(self.filename(url) + '.json', 'w') as meta_file:
+            json.dump(meta, meta_file)
+
+
+class AsyncDataCrawler(DataCrawler):
+    """
+    Crawls the weekly projections concurrently. Requests are limited by both a concurrency limit and a token bucket,
+    responses are kept in an on-disk cache and revalidated with ETag/Last-Modified, and every parsed week is
+    checkpointed so an interrupted crawl resumes with the weeks it has not finished yet.
+    """
+
+    def __init__(self, concurrency: int = 2, rate: float = 0.1, burst: int = 1, projection_url: str = None,
+                 resources_dir: str = None, pages_dir: str = None, parser=None):
+        super().__init__(parser)
+        self.concurrency = concurrency
+        self.rate = rate
+        self.burst = burst
+        self.projection_url = projection_url or self.PROJECTION_URL
+        self.resources_dir = resources_dir or os.path.join(os.path.dirname(os.path.dirname(__file__)), 'resources')
+        self.cache = HttpCache(os.path.join(self.resources_dir, 'http_cache'))
+        self.checkpoint_filename = os.path.join(self.resources_dir, 'crawl_checkpoint.json')
+        self.pages_dir = pages_dir
+        self.pages_fetched = 0
+        self.pages_revalidated = 0
+
+    def crawl_project_stats(self, weeks: range = range(1, 19)) -> dict:
+        start = time.perf_counter()
+        week_data = asyncio.run(self.crawl_weeks(weeks))
+        elapsed = time.perf_counter() - start
+        pages = self.pages_fetched + self.pages_revalidated
+        print("Crawled " + str(pages) + " pages (" + str(self.pages_revalidated) + " unchanged) in " +
+              format(elapsed, ".2f") + "s, " + format(pages / elapsed if elapsed else 0.0, ".2f") + " pages/second")
+        self.save_player_stats(week_data, self.resources_dir)
+        os.remove(self.checkpoint_filename)
+        return week_data
+
+    async def crawl_weeks(self, weeks: range) -> dict:
+        checkpoint = self.load_checkpoint()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        bucket = TokenBucket(self.rate, self.burst)
+
+        async def crawl_week(week: int) -> None:
+            async with semaphore:
+                text = await self.fetch(self.projection_url.format(stat_week=week), bucket)
+            if self.pages_dir is not None:
+                os.makedirs(self.pages_dir, exist_ok=True)
+                with open(os.path.join(self.pages_dir, 'week_' + str(week) + '.html'), 'w', encoding='utf-8') as f:
+                    f.write(text)
+            checkpoint[str(week)] = list(self.load_player_stats_from_projection(text))
+            self.save_checkpoint(checkpoint)
+            print("Loaded data for week: " + str(week))
+
+        remaining = [week for week in weeks if str(week) not in checkpoint]
+        results = await asyncio.gather(*[crawl_week(week) for week in remaining], return_exceptions=True)
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            raise errors[0]
+        return {week: checkpoint[str(week)] for week in weeks}
+
+    async def fetch(self, url: str, bucket: TokenBucket) -> str:
+        await bucket.acquire()
+        headers = self.cache.validators(url)
+        response = await asyncio.to_thread(self.get, url, headers=headers, timeout=60)
+        if response.status_code == 304:
+            self.pages_revalidated += 1
+            return self.cache.get(url)[0]
+        response.raise_for_status()
+        self.pages_fetched += 1
+        self.cache.put(url, response.text, response.headers)
+        return response.text
+
+    def load_checkpoint(self) -> dict:
+        try:
+            with open(self.checkpoint_filename, 'r') as checkpoint_file:
+                checkpoint = json.load(checkpoint_file)
+        except (OSError, ValueError):
+            return {}
+        if checkpoint.get('projection_url') != self.projection_url:
+            return {}
+        return checkpoint['weeks']
+
+    def save_checkpoint(self, weeks: dict) -> None:
+        os.makedirs(self.resources_dir, exist_ok=True)
+        with open(self.checkpoint_filename + '.tmp', 'w') as checkpoint_file:
+            json.dump({'projection_url': self.projection_url, 'weeks': weeks}, checkpoint_file)
+        os.replace(self.checkpoint_filename + '.tmp', self.checkpoint_filename)
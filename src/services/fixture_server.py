@@ -0,0 +1,100 @@
+import argparse
+import hashlib
+import os
+import threading
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class FixtureServer:
+    """
+    Serves saved pages over HTTP as a local stand-in for the projection and box score sites. A request whose query
+    has a statWeek is answered with week_<statWeek>.html, any other request with the file at its path. Responses
+    carry ETag and Last-Modified headers and conditional requests are answered with 304 Not Modified.
+    """
+
+    def __init__(self, directory: str, host: str = "127.0.0.1", port: int = 0):
+        self.directory = os.path.abspath(directory)
+        self.requests_served = 0
+        self.server = ThreadingHTTPServer((host, port), self.handler())
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return "http://" + host + ":" + str(port)
+
+    @property
+    def projection_url(self) -> str:
+        return self.url + "/research/projections?statWeek={stat_week}"
+
+    def filename(self, path: str):
+        parsed = urlparse(path)
+        weeks = parse_qs(parsed.query).get("statWeek")
+        name = "week_" + weeks[0] + ".html" if weeks else parsed.path.lstrip("/")
+        filename = os.path.abspath(os.path.join(self.directory, name))
+        if not filename.startswith(self.directory + os.sep) or not os.path.isfile(filename):
+            return None
+        return filename
+
+    def handler(self):
+        fixtures = self
+
+        class FixtureHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                fixtures.requests_served += 1
+                filename = fixtures.filename(self.path)
+                if filename is None:
+                    self.send_error(404)
+                    return
+                with open(filename, "rb") as fixture_file:
+                    body = fixture_file.read()
+                etag = '"' + hashlib.md5(body).hexdigest() + '"'
+                last_modified = formatdate(os.path.getmtime(filename), usegmt=True)
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.send_header("Last-Modified", last_modified)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return FixtureHandler
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serves saved pages as a local stand-in for the crawled sites.")
+    parser.add_argument("directory")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+    server = FixtureServer(args.directory, port=args.port)
+    print("Serving " + server.directory + " at " + server.url)
+    server.server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from player_store import PlayerStore  # noqa: E402
+from parsers import PARSERS  # noqa: E402
+
+# Maps each box score stat to the store category it is kept under.
+BOX_SCORE_CATEGORIES = {"pass_yards": "passing_yards", "pass_td": "passing_td", "pass_int": "interceptions",
+                        "rush_yards": "rushing_yards", "rush_td": "rushing_td", "receiving_yards": "receiving_yards",
+                        "receiving_td": "receiving_td", "fumbles_lost": "fumbles", "receptions": "receptions"}
+
+# The parser of each worker process, created on its first page.
+_parsers = {}
+
+
+def parse_box_score(parser_name: str, text: str) -> tuple[list[str], list[str], np.ndarray]:
+    """
+    Parses a box score page into columns, the players' names and teams and a players x stat categories array, which
+    are far cheaper to send back from a worker process than a dict per player.
+    """
+    parser = _parsers.setdefault(parser_name, PARSERS[parser_name]())
+    names, teams, stats = [], [], []
+    for row in parser.box_score_rows(text):
+        names.append(row["name"])
+        teams.append(row["team"])
+        stats.append([row.get(stat, 0) for stat in BOX_SCORE_CATEGORIES])
+    columns = [PlayerStore.STAT_CATEGORIES.index(category) for category in BOX_SCORE_CATEGORIES.values()]
+    values = np.zeros((len(stats), len(PlayerStore.STAT_CATEGORIES)))
+    if stats:
+        values[:, columns] = stats
+    return names, teams, values
+
+
+class GameLog:
+    """
+    The ingested games of one season, written incrementally as columnar parts. Each part holds a batch of games:
+    one row per player per game, the players' stats as a rows x stat categories array, the game of every row and a
+    string table of names and teams. Once a part is on disk its games are appended to games.jsonl and fsync'd, so
+    a game is ingested exactly when it is in that file. Rows of a part a crash left out of it are ignored and their
+    games are fetched again.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.games_filename = os.path.join(directory, "games.jsonl")
+        self.games = []
+        os.makedirs(directory, exist_ok=True)
+        try:
+            with open(self.games_filename, 'rb') as games_file:
+                lines = games_file.readlines()
+        except FileNotFoundError:
+            lines = []
+        offset = 0
+        for line_number, line in enumerate(lines):
+            try:
+                if not line.endswith(b"\n"):
+                    raise ValueError("Unterminated record")
+                record = json.loads(line)
+            except ValueError:
+                # Only the last line can be torn by a crash. Its game is simply ingested again, once the torn line
+                # is cut off so the next append starts on a line of its own.
+                if line_number == len(lines) - 1:
+                    os.truncate(self.games_filename, offset)
+                    break
+                raise
+            offset += len(line)
+            self.games.append(record)
+        self.ingested = {game["link"] for game in self.games}
+        parts = [int(name[len("part_"):]) for name in os.listdir(directory) if name.startswith("part_")]
+        self.next_part = max(parts, default=-1) + 1
+
+    def append(self, games: list[tuple[dict, tuple]]) -> None:
+        """
+        Writes a batch of parsed games, (game, (names, teams, stats)) pairs, as a new part.
+        """
+        if not games:
+            return
+        part = self.next_part
+        self.next_part += 1
+        path = os.path.join(self.directory, "part_" + str(part).zfill(5))
+        os.makedirs(path, exist_ok=True)
+        strings = list(dict.fromkeys(value for _, (names, teams, _) in games for value in [*names, *teams]))
+        string_index = {value: idx for idx, value in enumerate(strings)}
+        rows = np.zeros(sum(len(names) for _, (names, _, _) in games),
+                        dtype=[("game", "<i4"), ("name", "<i4"), ("team", "<i4")])
+        start = 0
+        for game_number, (_, (names, teams, _)) in enumerate(games):
+            rows["game"][start:start + len(names)] = game_number
+            rows["name"][start:start + len(names)] = [string_index[name] for name in names]
+            rows["team"][start:start + len(names)] = [string_index[team] for team in teams]
+            start += len(names)
+        np.save(os.path.join(path, "rows.npy"), rows)
+        np.save(os.path.join(path, "stats.npy"),
+                np.concatenate([stats for _, (_, _, stats) in games]).astype("<f8").reshape(-1, len(
+                    PlayerStore.STAT_CATEGORIES)))
+        with open(os.path.join(path, "strings.json"), 'w') as strings_file:
+            json.dump(strings, strings_file)
+
+        records = [{"link": game["link"], "week": game["week"], "part": part, "game": game_number}
+                   for game_number, (game, _) in enumerate(games)]
+        with open(self.games_filename, 'a') as games_file:
+            games_file.write("".join(json.dumps(record) + "\n" for record in records))
+            games_file.flush()
+            os.fsync(games_file.fileno())
+        self.games.extend(records)
+        self.ingested.update(record["link"] for record in records)
+
+    def to_store(self) -> PlayerStore:
+        """
+        Builds a player store of the season, with a column per week, or per game for games whose week is unknown.
+        Parts are read memory-mapped one at a time.
+        """
+        labels = list(dict.fromkeys(str(game["week"]) if game["week"] is not None else game["link"]
+                                    for game in self.games))
+        weeks = sorted(labels, key=lambda label: (not label.isdigit(), int(label) if label.isdigit() else 0, label))
+        week_index = {week: idx for idx, week in enumerate(weeks)}
+        game_weeks = {}
+        for game in self.games:
+            label = str(game["week"]) if game["week"] is not None else game["link"]
+            game_weeks.setdefault(game["part"], {})[game["game"]] = week_index[label]
+
+        player_index, names, teams = {}, [], []
+        chunks = []
+        for part, part_weeks in sorted(game_weeks.items()):
+            path = os.path.join(self.directory, "part_" + str(part).zfill(5))
+            with open(os.path.join(path, "strings.json"), 'r') as strings_file:
+                strings = json.load(strings_file)
+            rows = np.load(os.path.join(path, "rows.npy"))
+            stats = np.load(os.path.join(path, "stats.npy"), mmap_mode='r')
+            # Games of the part missing from games.jsonl keep a week of -1, so their rows are left out.
+            lookup = np.full(int(rows["game"].max(initial=-1)) + 1, -1)
+            lookup[list(part_weeks)] = list(part_weeks.values())
+            row_weeks = lookup[rows["game"]]
+            kept = np.flatnonzero(row_weeks >= 0)
+            players = np.zeros(len(strings), dtype=np.int64)
+            for idx in np.unique(rows["name"][kept]).tolist():
+                if strings[idx] not in player_index:
+                    player_index[strings[idx]] = len(names)
+                    names.append(strings[idx])
+                    teams.append(None)
+                players[idx] = player_index[strings[idx]]
+            # A player traded mid season is listed with the team of their latest game.
+            for name, team in zip(rows["name"][kept].tolist(), rows["team"][kept].tolist()):
+                teams[players[name]] = strings[team]
+            chunks.append((players[rows["name"][kept]], row_weeks[kept], np.asarray(stats[kept])))
+
+        values = np.zeros((len(names), len(weeks), len(PlayerStore.STAT_CATEGORIES)))
+        played = np.zeros((len(names), len(weeks)), dtype=bool)
+        for players, row_weeks, stats in chunks:
+            np.add.at(values, (players, row_weeks), stats)
+            played[players, row_weeks] = True
+        return PlayerStore(names, ["N/A"] * len(names), teams, weeks, values, played)
+
+
+class HistoricalIngest:
+    """
+    Ingests every box score of one or more seasons into a GameLog per season and saves each season as a player
+    store bundle. The schedule's box score links stream through a bounded queue to a few fetchers and each fetched
+    page is parsed in a process pool, so only about `queue_size` links and one page per fetcher are held at once and
+    memory stays flat however many seasons are ingested. Parsed games are written out every `batch_size` games and
+    games already in a season's log are never fetched again, so an interrupted or repeated run only fetches what is
+    missing.
+    """
+
+    def __init__(self, crawler, directory: str, root_url: str = "", workers: int = None, fetchers: int = 4,
+                 queue_size: int = 32, batch_size: int = 64, parser: str = "streaming"):
+        self.crawler = crawler
+        self.directory = directory
+        self.root_url = root_url
+        self.workers = workers
+        self.fetchers = fetchers
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.parser = parser
+        self.games_ingested = 0
+        self.games_skipped = 0
+
+    def run(self, seasons: dict[str, str]) -> dict[str, PlayerStore]:
+        """
+        Ingests each season from its schedule page url and returns the store of every season.
+        """
+        return asyncio.run(self.ingest(seasons))
+
+    async def ingest(self, seasons: dict[str, str]) -> dict[str, PlayerStore]:
+        stores = {}
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            for season, schedule_url in seasons.items():
+                start = time.perf_counter()
+                ingested, skipped = self.games_ingested, self.games_skipped
+                log = await self.ingest_season(schedule_url, GameLog(os.path.join(self.directory, season)), executor)
+                store = log.to_store()
+                store.save(os.path.join(self.directory, season + ".bundle"))
+                stores[season] = store
+                elapsed = time.perf_counter() - start
+                games = self.games_ingested - ingested
+                print("Ingested " + str(games) + " games of " + season + " (" +
+                      str(self.games_skipped - skipped) + " already ingested) in " + format(elapsed, ".2f") + "s, " +
+                      format(games / elapsed if elapsed else 0.0, ".1f") + " games/second")
+        return stores
+
+    async def ingest_season(self, schedule_url: str, log: GameLog, executor: ProcessPoolExecutor) -> GameLog:
+        response = await asyncio.to_thread(self.crawler.get, schedule_url, timeout=60)
+        response.raise_for_status()
+        games = list({game["link"]: game for game in PARSERS[self.parser]().box_score_games(response.text)}.values())
+        missing = [game for game in games if game["link"] not in log.ingested]
+        self.games_skipped += len(games) - len(missing)
+
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        parsed = []
+        loop = asyncio.get_running_loop()
+
+        async def produce() -> None:
+            for game in missing:
+                await queue.put(game)
+            for _ in range(self.fetchers):
+                await queue.put(None)
+
+        async def fetch() -> None:
+            while (game := await queue.get()) is not None:
+                page = await asyncio.to_thread(self.crawler.get, self.root_url + game["link"], timeout=60)
+                page.raise_for_status()
+                parsed.append((game, await loop.run_in_executor(executor, parse_box_score, self.parser, page.text)))
+                self.games_ingested += 1
+                if len(parsed) >= self.batch_size:
+                    log.append(parsed[:])
+                    parsed.clear()
+
+        tasks = [asyncio.create_task(produce()), *[asyncio.create_task(fetch()) for _ in range(self.fetchers)]]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            # Whatever was parsed before a failure is kept, so the next run carries on from there.
+            log.append(parsed)
+        return log
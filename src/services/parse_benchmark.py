@@ -0,0 +1,64 @@
+import argparse
+import glob
+import json
+import os
+import time
+
+from parsers import PARSERS
+
+
+def benchmark(pages: list[str], method: str, repeat: int) -> dict:
+    """
+    Parses every page with every backend, checks that each backend serializes to exactly the same json as the
+    BeautifulSoup backend and returns the best time of `repeat` runs for each backend.
+    """
+    texts = []
+    for page in pages:
+        with open(page, 'r', encoding='utf-8') as page_file:
+            texts.append(page_file.read())
+
+    timings = {}
+    expected = None
+    for name, parser_class in PARSERS.items():
+        parser = parser_class()
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            output = [list(getattr(parser, method)(text)) for text in texts]
+            best = min(best, time.perf_counter() - start)
+        serialized = json.dumps(output)
+        if expected is None:
+            expected = serialized
+        elif serialized != expected:
+            raise AssertionError(name + " parser output differs from the soup parser for " + method)
+        timings[name] = best
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks the page parser backends over saved fixture pages.")
+    parser.add_argument("directory", help="directory of week_<n>.html projection pages and, optionally, "
+                                          "boxscores/*.htm(l) and schedule.html or years/<season>/games.htm pages, "
+                                          "as benchmarks/synthetic.py --pages writes them")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    schedules = sorted(glob.glob(os.path.join(args.directory, "schedule.html")) +
+                       glob.glob(os.path.join(args.directory, "years", "*", "games.htm")))
+    suites = [("projection_rows", sorted(glob.glob(os.path.join(args.directory, "week_*.html")))),
+              ("box_score_rows", sorted(glob.glob(os.path.join(args.directory, "boxscores", "*.htm*")))),
+              ("box_score_links", schedules),
+              ("box_score_games", schedules)]
+    for method, pages in suites:
+        if not pages:
+            continue
+        timings = benchmark(pages, method, args.repeat)
+        size = sum(os.path.getsize(page) for page in pages) / 1e6
+        print(method + ": " + str(len(pages)) + " pages, " + format(size, ".1f") + " MB, identical output")
+        for name, seconds in timings.items():
+            print("  " + name.ljust(10) + format(seconds, ".3f") + "s  " + format(size / seconds, ".1f") + " MB/s  " +
+                  format(timings["soup"] / seconds, ".1f") + "x")
+
+
+if __name__ == "__main__":
+    main()
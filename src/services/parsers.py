@@ -0,0 +1,282 @@
+from html.parser import HTMLParser
+
+from bs4 import BeautifulSoup
+
+
+class SoupParser:
+    """
+    Parses the crawled pages by building a full BeautifulSoup tree and querying it.
+    """
+
+    def projection_rows(self, text):
+        soup = BeautifulSoup(text, 'html.parser')
+        tbody = soup.find('tbody')
+        if not tbody:
+            raise Exception("Couldn't find table body to parse players")
+        players = tbody.find_all('tr')
+        for player in players:
+            player_name = player.find('a', {'class': 'playerName'}).text
+            position_and_team = player.find('em').text.split(" - ")
+            player_position = position_and_team[0]
+            if len(position_and_team) > 1:
+                player_team = position_and_team[1]
+            else:
+                player_team = "N/A"
+            passing_yards = player.find('td', {'class': 'stat_5'}).text
+            passing_tds = player.find('td', {'class': 'stat_6'}).text
+            interceptions = player.find('td', {'class': 'stat_7'}).text
+            rushing_yards = player.find('td', {'class': 'stat_14'}).text
+            rushing_tds = player.find('td', {'class': 'stat_15'}).text
+            receiving_yards = player.find('td', {'class': 'stat_21'}).text
+            receiving_tds = player.find('td', {'class': 'stat_22'}).text
+            fumbles = player.find('td', {'class': 'stat_30'}).text
+            # Not every projection page has a receptions column.
+            receptions = player.find('td', {'class': 'stat_20'})
+            receptions = receptions.text if receptions is not None else "-"
+            yield {"player_name": player_name, "passing_yards": passing_yards, "passing_tds": passing_tds,
+                   "interceptions": interceptions, "rushing_yards": rushing_yards, "rushing_tds": rushing_tds,
+                   "receiving_yards": receiving_yards, "receiving_tds": receiving_tds, "fumbles": fumbles,
+                   "receptions": receptions, "player_position": player_position, "player_team": player_team}
+
+    def box_score_links(self, text):
+        for game in self.box_score_games(text):
+            yield game["link"]
+
+    def box_score_games(self, text):
+        soup = BeautifulSoup(text, 'html.parser')
+        boxscore_tds = soup.select('td[data-stat="boxscore_word"]')
+        for td in boxscore_tds:
+            row = td.find_parent('tr')
+            week = row.select('[data-stat="week_num"]') if row is not None else []
+            links = td.find_all('a', href=True)
+            for link in links:
+                yield {"link": link['href'], "week": week[0].text if week else None}
+
+    def box_score_rows(self, text):
+        soup = BeautifulSoup(text, 'html.parser')
+        player_offense = soup.find(id="player_offense")
+        player_stats = player_offense.find_all('tr')
+        for stat in player_stats:
+            names = stat.select('th[data-stat="player"][data-append-csv]')
+            if not names:
+                continue
+            receptions = stat.select('td[data-stat="rec"]')
+            yield {"name": names[0].text,
+                   "team": stat.select('td[data-stat="team"]')[0].text,
+                   "pass_yards": int(stat.select('td[data-stat="pass_yds"]')[0].text),
+                   "pass_td": int(stat.select('td[data-stat="pass_td"]')[0].text),
+                   "pass_int": int(stat.select('td[data-stat="pass_int"]')[0].text),
+                   "rush_yards": int(stat.select('td[data-stat="rush_yds"]')[0].text),
+                   "rush_td": int(stat.select('td[data-stat="rush_td"]')[0].text),
+                   "receiving_yards": int(stat.select('td[data-stat="rec_yds"]')[0].text),
+                   "receiving_td": int(stat.select('td[data-stat="rec_td"]')[0].text),
+                   "fumbles_lost": int(stat.select('td[data-stat="fumbles_lost"]')[0].text),
+                   # Older box scores have no receptions column.
+                   "receptions": int(receptions[0].text) if receptions else 0}
+
+
+class _RowExtractor(HTMLParser):
+    """
+    Walks a page once, tracking open tags the way BeautifulSoup's html.parser builder does (an end tag closes every
+    tag opened after its start tag), and collects the text of the first matching element for each key of a row.
+    """
+
+    VOID_ELEMENTS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "param", "source",
+                     "track", "wbr"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.stack = []
+        self.captures = []
+        self.row = None
+        self.row_depth = None
+        self.rows = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag not in self.VOID_ELEMENTS:
+            self.stack.append(tag)
+        self.start(tag, dict(attrs), len(self.stack))
+
+    def handle_endtag(self, tag):
+        if tag in self.VOID_ELEMENTS or tag not in self.stack:
+            return
+        while self.stack:
+            depth = len(self.stack)
+            closed = self.stack.pop()
+            self.end(depth)
+            if closed == tag:
+                break
+
+    def handle_data(self, data):
+        for capture in self.captures:
+            capture[2].append(data)
+
+    def finish(self) -> None:
+        # Tags left open at the end of the page are closed by it, as they are in a tree.
+        self.close()
+        while self.stack:
+            depth = len(self.stack)
+            self.stack.pop()
+            self.end(depth)
+
+    def start(self, tag: str, attrs: dict, depth: int) -> None:
+        pass
+
+    def start_row(self, depth: int) -> None:
+        if self.row is None:
+            self.row = {}
+            self.row_depth = depth
+
+    def capture(self, key: str, depth: int) -> None:
+        if self.row is not None and key not in self.row and all(key != capture[1] for capture in self.captures):
+            self.captures.append((depth, key, []))
+
+    def end(self, depth: int) -> None:
+        for capture in [capture for capture in self.captures if capture[0] == depth]:
+            self.captures.remove(capture)
+            self.row[capture[1]] = "".join(capture[2])
+        if self.row is not None and depth == self.row_depth:
+            self.rows.append(self.row)
+            self.row = None
+
+
+class _ProjectionExtractor(_RowExtractor):
+    STAT_CLASSES = {"stat_5": "passing_yards", "stat_6": "passing_tds", "stat_7": "interceptions",
+                    "stat_14": "rushing_yards", "stat_15": "rushing_tds", "stat_20": "receptions",
+                    "stat_21": "receiving_yards", "stat_22": "receiving_tds", "stat_30": "fumbles"}
+
+    def __init__(self):
+        super().__init__()
+        self.found_tbody = False
+        self.tbody_depth = None
+
+    def start(self, tag, attrs, depth):
+        if tag == "tbody" and not self.found_tbody:
+            self.found_tbody = True
+            self.tbody_depth = depth
+        elif self.tbody_depth is None:
+            return
+        elif tag == "tr":
+            self.start_row(depth)
+        elif tag == "a" and "playerName" in (attrs.get("class") or "").split():
+            self.capture("player_name", depth)
+        elif tag == "em":
+            self.capture("em", depth)
+        elif tag == "td":
+            for css_class in (attrs.get("class") or "").split():
+                if css_class in self.STAT_CLASSES:
+                    self.capture(self.STAT_CLASSES[css_class], depth)
+
+    def end(self, depth):
+        super().end(depth)
+        if depth == self.tbody_depth:
+            self.tbody_depth = None
+
+
+class _BoxScoreExtractor(_RowExtractor):
+    DATA_STATS = {"team": "team", "pass_yds": "pass_yards", "pass_td": "pass_td", "pass_int": "pass_int",
+                  "rush_yds": "rush_yards", "rush_td": "rush_td", "rec_yds": "receiving_yards",
+                  "rec_td": "receiving_td", "fumbles_lost": "fumbles_lost", "rec": "receptions"}
+
+    def __init__(self):
+        super().__init__()
+        self.found_offense = False
+        self.offense_depth = None
+
+    def start(self, tag, attrs, depth):
+        if attrs.get("id") == "player_offense" and not self.found_offense:
+            self.found_offense = True
+            self.offense_depth = depth
+        elif self.offense_depth is None:
+            return
+        elif tag == "tr":
+            self.start_row(depth)
+        elif tag == "th" and attrs.get("data-stat") == "player" and "data-append-csv" in attrs:
+            self.capture("name", depth)
+        elif tag == "td" and attrs.get("data-stat") in self.DATA_STATS:
+            self.capture(self.DATA_STATS[attrs["data-stat"]], depth)
+
+    def end(self, depth):
+        super().end(depth)
+        if depth == self.offense_depth:
+            self.offense_depth = None
+
+
+class _LinkExtractor(_RowExtractor):
+
+    def __init__(self):
+        super().__init__()
+        self.boxscore_depths = []
+        self.links = []
+
+    def start(self, tag, attrs, depth):
+        if tag == "tr":
+            self.start_row(depth)
+        elif tag in ("th", "td") and attrs.get("data-stat") == "week_num":
+            self.capture("week", depth)
+        if tag == "td" and attrs.get("data-stat") == "boxscore_word":
+            self.boxscore_depths.append(depth)
+        elif tag == "a" and self.boxscore_depths and "href" in attrs:
+            # The row's week is filled in once its cell closes, which may be after the link.
+            self.links.append((attrs["href"], self.row))
+
+    def end(self, depth):
+        super().end(depth)
+        if self.boxscore_depths and self.boxscore_depths[-1] == depth:
+            self.boxscore_depths.pop()
+
+
+class StreamingParser:
+    """
+    Parses the crawled pages in a single event-driven pass over the markup without building a tree, mapping each
+    row's stat_N / data-stat cells as they stream past. It yields exactly what SoupParser does for the same page.
+    """
+
+    PROJECTION_STATS = ["passing_yards", "passing_tds", "interceptions", "rushing_yards", "rushing_tds",
+                        "receiving_yards", "receiving_tds", "fumbles"]
+    BOX_SCORE_STATS = ["pass_yards", "pass_td", "pass_int", "rush_yards", "rush_td", "receiving_yards",
+                       "receiving_td", "fumbles_lost"]
+
+    @staticmethod
+    def feed(extractor: _RowExtractor, text: str) -> _RowExtractor:
+        extractor.feed(text)
+        extractor.finish()
+        return extractor
+
+    def projection_rows(self, text):
+        extractor = self.feed(_ProjectionExtractor(), text)
+        if not extractor.found_tbody:
+            raise Exception("Couldn't find table body to parse players")
+        for row in extractor.rows:
+            if "player_name" not in row or "em" not in row:
+                raise AttributeError("Couldn't find the player name and position in a projection row")
+            position_and_team = row["em"].split(" - ")
+            player_position = position_and_team[0]
+            if len(position_and_team) > 1:
+                player_team = position_and_team[1]
+            else:
+                player_team = "N/A"
+            yield {"player_name": row["player_name"], **{stat: row[stat] for stat in self.PROJECTION_STATS},
+                   "receptions": row.get("receptions", "-"), "player_position": player_position,
+                   "player_team": player_team}
+
+    def box_score_links(self, text):
+        for link, _ in self.feed(_LinkExtractor(), text).links:
+            yield link
+
+    def box_score_games(self, text):
+        for link, row in self.feed(_LinkExtractor(), text).links:
+            yield {"link": link, "week": row.get("week") if row is not None else None}
+
+    def box_score_rows(self, text):
+        extractor = self.feed(_BoxScoreExtractor(), text)
+        if not extractor.found_offense:
+            raise AttributeError("Couldn't find the player_offense table")
+        for row in extractor.rows:
+            if "name" not in row:
+                continue
+            yield {"name": row["name"], "team": row["team"], **{stat: int(row[stat]) for stat in self.BOX_SCORE_STATS},
+                   "receptions": int(row["receptions"]) if "receptions" in row else 0}
+
+
+PARSERS = {"soup": SoupParser, "streaming": StreamingParser}
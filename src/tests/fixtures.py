@@ -0,0 +1,20 @@
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+from models import Player  # noqa: E402
+from player_store import PlayerStore  # noqa: E402
+from synthetic import write_projections  # noqa: E402
+
+
+def synthetic_players(players: int, weeks: int = 18, seed: int = 0) -> list[Player]:
+    """
+    A seeded synthetic pool of the given size, as the draft sees it.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        json_filename = os.path.join(directory, "projections.json")
+        write_projections(json_filename, players, weeks, seed)
+        store = PlayerStore.from_json(json_filename)
+    return [Player(store, idx) for idx in range(len(store))]
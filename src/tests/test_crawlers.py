@@ -0,0 +1,118 @@
+import contextlib
+import glob
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+import requests
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "services"))
+from async_crawler import AsyncDataCrawler  # noqa: E402
+from data_crawler import DataCrawler  # noqa: E402
+from fixture_server import FixtureServer  # noqa: E402
+from historical_ingest import GameLog, parse_box_score  # noqa: E402
+from parsers import StreamingParser  # noqa: E402
+from synthetic import write_projection_pages, write_season_pages  # noqa: E402
+
+
+class CrawlerTest(unittest.TestCase):
+    """
+    Crawls pages served by a local FixtureServer, breaking a run halfway by hiding one of its pages.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.pages_dir = os.path.join(self.directory.name, "pages")
+        self.resources_dir = os.path.join(self.directory.name, "resources")
+        self.fixtures = FixtureServer(self.pages_dir).start()
+        self.addCleanup(self.fixtures.stop)
+        # The crawlers report their progress, which only clutters the test output.
+        quiet = contextlib.redirect_stdout(io.StringIO())
+        quiet.__enter__()
+        self.addCleanup(quiet.__exit__, None, None, None)
+
+    def hide(self, page: str) -> str:
+        hidden = os.path.join(self.directory.name, os.path.basename(page))
+        shutil.move(os.path.join(self.pages_dir, page), hidden)
+        return hidden
+
+    def projection_crawler(self) -> AsyncDataCrawler:
+        return AsyncDataCrawler(concurrency=2, rate=1000.0, burst=8, projection_url=self.fixtures.projection_url,
+                                resources_dir=self.resources_dir)
+
+    def test_projection_crawl_resumes_and_revalidates(self):
+        write_projection_pages(self.pages_dir, 40, weeks=4)
+        expected = {}
+        for week in range(1, 5):
+            with open(os.path.join(self.pages_dir, "week_" + str(week) + ".html"), 'r') as page_file:
+                expected[week] = list(StreamingParser().projection_rows(page_file.read()))
+
+        hidden = self.hide("week_3.html")
+        with self.assertRaises(requests.HTTPError):
+            self.projection_crawler().crawl_project_stats(range(1, 5))
+        with open(os.path.join(self.resources_dir, "crawl_checkpoint.json"), 'r') as checkpoint_file:
+            self.assertEqual(sorted(json.load(checkpoint_file)["weeks"]), ["1", "2", "4"])
+
+        shutil.move(hidden, os.path.join(self.pages_dir, "week_3.html"))
+        served = self.fixtures.requests_served
+        crawler = self.projection_crawler()
+        self.assertEqual(crawler.crawl_project_stats(range(1, 5)), expected)
+        self.assertEqual(self.fixtures.requests_served - served, 1)
+        self.assertFalse(os.path.exists(os.path.join(self.resources_dir, "crawl_checkpoint.json")))
+        with open(os.path.join(self.resources_dir, "projected_player_stats.json"), 'r') as stats_file:
+            self.assertEqual(json.load(stats_file), {str(week): rows for week, rows in expected.items()})
+
+        # A finished crawl starts over, but every page is answered from the cache once the server says it is
+        # unchanged.
+        crawler = self.projection_crawler()
+        self.assertEqual(crawler.crawl_project_stats(range(1, 5)), expected)
+        self.assertEqual((crawler.pages_fetched, crawler.pages_revalidated), (0, 4))
+
+    def test_historical_ingest_resumes_and_skips_ingested_games(self):
+        games = write_season_pages(self.pages_dir, 2023, players=80, weeks=2)
+        crawler = DataCrawler()
+        crawler.ROOT_URL = self.fixtures.url
+        crawler.ROOT = self.fixtures.url + "/years/{season}/games.htm"
+        options = {"workers": 2, "fetchers": 2, "batch_size": 3}
+        with open(os.path.join(self.pages_dir, "years", "2023", "games.htm"), 'r') as schedule_file:
+            links = list(StreamingParser().box_score_links(schedule_file.read()))
+        self.assertEqual(len(links), games)
+
+        hidden = self.hide(links[-1].lstrip("/"))
+        with self.assertRaises(requests.HTTPError):
+            crawler.crawl_historical_stats([2023], self.resources_dir, **options)
+        log = GameLog(os.path.join(self.resources_dir, "historical_stats", "2023"))
+        self.assertTrue(0 < len(log.games) < games)
+
+        shutil.move(hidden, os.path.join(self.pages_dir, links[-1].lstrip("/")))
+        served = self.fixtures.requests_served
+        store = crawler.crawl_historical_stats([2023], self.resources_dir, **options)["2023"]
+        # The schedule and the games the broken run did not get to.
+        self.assertEqual(self.fixtures.requests_served - served, 1 + games - len(log.games))
+        log = GameLog(os.path.join(self.resources_dir, "historical_stats", "2023"))
+        self.assertEqual(sorted(game["link"] for game in log.games), sorted(links))
+
+        names, stats = set(), []
+        for page in glob.glob(os.path.join(self.pages_dir, "boxscores", "*.htm")):
+            with open(page, 'r') as page_file:
+                page_names, _, page_stats = parse_box_score("streaming", page_file.read())
+            names.update(page_names)
+            stats.append(page_stats.sum(axis=0))
+        self.assertEqual(set(store.names), names)
+        np.testing.assert_allclose(store.stats.sum(axis=(0, 1)), np.sum(stats, axis=0))
+
+        served = self.fixtures.requests_served
+        crawler.crawl_historical_stats([2023], self.resources_dir, **options)
+        self.assertEqual(self.fixtures.requests_served - served, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+from constants import Constants  # noqa: E402
+from draft_service import DraftService, RequestError  # noqa: E402
+from models import Player  # noqa: E402
+from synthetic import write_projections  # noqa: E402
+
+
+class DraftServiceTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        json_filename = os.path.join(cls.directory.name, "projections.json")
+        write_projections(json_filename, 200)
+        cls.constants = (Constants.PROJECTED_PLAYER_STATS_FILENAME, Constants.PLAYER_STORE_BUNDLE,
+                         Constants.SNAPSHOT_DIR)
+        Constants.PROJECTED_PLAYER_STATS_FILENAME = json_filename
+        Constants.PLAYER_STORE_BUNDLE = os.path.join(cls.directory.name, "missing.bundle")
+        Constants.SNAPSHOT_DIR = os.path.join(cls.directory.name, "snapshots")
+        cls.players = Player.load()
+
+    @classmethod
+    def tearDownClass(cls):
+        (Constants.PROJECTED_PLAYER_STATS_FILENAME, Constants.PLAYER_STORE_BUNDLE,
+         Constants.SNAPSHOT_DIR) = cls.constants
+        cls.directory.cleanup()
+
+    def setUp(self):
+        self.sessions = tempfile.TemporaryDirectory()
+        self.addCleanup(self.sessions.cleanup)
+        self.service = DraftService(self.players, self.sessions.name)
+
+    def request(self, method: str, path: str, payload: dict = None) -> tuple:
+        body = json.dumps(payload).encode() if payload is not None else b""
+        return asyncio.run(self.service.dispatch(method, path, body))
+
+    def test_reopened_session_keeps_its_settings(self):
+        self.request("POST", "/drafts", {"session": "a", "drafters": 12})
+        self.request("POST", "/drafts/a/picks", {"player": next(iter(self.players))})
+        self.request("DELETE", "/drafts/a")
+
+        with self.assertRaises(RequestError) as conflict:
+            self.request("POST", "/drafts", {"session": "a", "drafters": 10})
+        self.assertEqual(conflict.exception.status, 409)
+        status, state = self.request("POST", "/drafts", {"session": "a"})
+        self.assertEqual((status, state["drafters"], state["pick"]), (201, 12, 2))
+        with open(os.path.join(self.sessions.name, "a", "session.json"), 'r') as session_file:
+            self.assertEqual(json.load(session_file)["drafters"], 12)
+
+    def test_unexpected_errors_are_answered_with_500(self):
+        os.makedirs(os.path.join(self.sessions.name, "broken"))
+        with open(os.path.join(self.sessions.name, "broken", "session.json"), 'w') as session_file:
+            json.dump({"drafters": 12, "my_position": -1}, session_file)
+        with open(os.path.join(self.sessions.name, "broken", "picks.journal"), 'w') as journal_file:
+            journal_file.write(json.dumps({"pick": 1, "slot": 0, "player": "Nobody"}) + "\n")
+
+        async def get() -> bytes:
+            server = await self.service.start(port=0)
+            reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+            writer.write(b"GET /drafts/broken HTTP/1.1\r\nConnection: close\r\n\r\n")
+            response = await reader.read()
+            writer.close()
+            server.close()
+            await server.wait_closed()
+            return response
+
+        with open(os.devnull, 'w') as devnull:
+            stderr, sys.stderr = sys.stderr, devnull
+            try:
+                response = asyncio.run(get())
+            finally:
+                sys.stderr = stderr
+        head, _, body = response.partition(b"\r\n\r\n")
+        self.assertTrue(head.startswith(b"HTTP/1.1 500 "))
+        self.assertIn("Nobody", json.loads(body)["error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "services"))
+from historical_ingest import GameLog  # noqa: E402
+from player_store import PlayerStore  # noqa: E402
+
+
+def parsed_game(link: str, week: str, yards: float) -> tuple:
+    stats = np.zeros((1, len(PlayerStore.STAT_CATEGORIES)))
+    stats[0, PlayerStore.STAT_CATEGORIES.index("rushing_yards")] = yards
+    return {"link": link, "week": week}, (["Player " + link], ["KC"], stats)
+
+
+class GameLogTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_torn_last_line_is_cut_before_appending(self):
+        log = GameLog(self.directory.name)
+        log.append([parsed_game("/g1", "1", 10.0), parsed_game("/g2", "1", 20.0)])
+        with open(log.games_filename, 'a') as games_file:
+            games_file.write('{"link": "/g3", "we')
+
+        log = GameLog(self.directory.name)
+        self.assertEqual(log.ingested, {"/g1", "/g2"})
+        log.append([parsed_game("/g3", "2", 30.0)])
+
+        log = GameLog(self.directory.name)
+        self.assertEqual(log.ingested, {"/g1", "/g2", "/g3"})
+        with open(log.games_filename, 'r') as games_file:
+            self.assertEqual([json.loads(line)["link"] for line in games_file], ["/g1", "/g2", "/g3"])
+        store = log.to_store()
+        self.assertEqual(store.weeks, ["1", "2"])
+        self.assertEqual(float(np.asarray(store.stats).sum()), 60.0)
+
+    def test_games_of_a_part_left_out_of_the_log_are_ignored(self):
+        log = GameLog(self.directory.name)
+        log.append([parsed_game("/g" + str(game), "1", 10.0 * game) for game in range(1, 5)])
+        with open(log.games_filename, 'r') as games_file:
+            lines = games_file.readlines()
+        with open(log.games_filename, 'w') as games_file:
+            games_file.write("".join(lines[:2]) + lines[2][:10])
+
+        log = GameLog(self.directory.name)
+        self.assertEqual(log.ingested, {"/g1", "/g2"})
+        log.append([parsed_game("/g3", "2", 30.0), parsed_game("/g4", "2", 40.0)])
+        store = log.to_store()
+        self.assertEqual(store.weeks, ["1", "2"])
+        self.assertEqual(sorted(store.names), ["Player /g1", "Player /g2", "Player /g3", "Player /g4"])
+        self.assertEqual(float(np.asarray(store.stats).sum()), 100.0)
+
+    def test_torn_line_before_the_last_is_an_error(self):
+        log = GameLog(self.directory.name)
+        log.append([parsed_game("/g1", "1", 10.0)])
+        with open(log.games_filename, 'a') as games_file:
+            games_file.write('{"link": "/g2", "we\n{"link": "/g3"}\n')
+        with self.assertRaises(ValueError):
+            GameLog(self.directory.name)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import contextlib
+import io
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from keeper_analysis import KeeperEngine  # noqa: E402
+from tests.fixtures import synthetic_players  # noqa: E402
+
+
+class KeeperEngineTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.store = synthetic_players(150)[0].store
+        cls.ranked = [cls.store.names[idx] for idx in cls.store.ranked().tolist()]
+
+    def setUp(self):
+        self.engine = KeeperEngine(self.store, total_drafters=6, drafts=12, workers=0)
+
+    def evaluate(self, keepers: list[dict], max_keepers: int = 3, default_team: int = 0) -> list[dict]:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return self.engine.evaluate(keepers, max_keepers, default_team)
+
+    def test_each_league_is_valued_at_its_own_size(self):
+        results = self.evaluate([{"name": self.ranked[0], "round": 4, "league": "small", "drafters": 4, "team": 3},
+                                 {"name": self.ranked[1], "round": 4, "league": "small", "team": 1},
+                                 {"name": self.ranked[2], "round": 4, "league": "default", "team": 5}])
+        self.assertEqual({size for size, _ in self.engine.pick_values}, {4, 6})
+        by_name = {result["name"]: result for result in results}
+        small = self.engine.round_values(4, 4, frozenset(self.store.names.index(self.ranked[idx]) for idx in [0, 1]))
+        self.assertEqual(by_name[self.ranked[0]]["round_value"], small[3, 3])
+        self.assertEqual(by_name[self.ranked[1]]["round_value"], small[3, 1])
+
+    def test_teams_must_be_slots_of_their_league(self):
+        with self.assertRaises(ValueError):
+            self.evaluate([{"name": self.ranked[0], "round": 1, "league": "small", "drafters": 4, "team": 4}])
+        with self.assertRaises(ValueError):
+            self.evaluate([{"name": self.ranked[0], "round": 1, "league": "a", "drafters": 4},
+                           {"name": self.ranked[1], "round": 2, "league": "a", "drafters": 8}])
+
+    def test_kept_players_are_off_the_board_of_the_simulated_drafts(self):
+        results = self.evaluate([{"name": self.ranked[0], "round": 5}, {"name": self.ranked[-1], "round": 1}])
+        kept = {result["name"]: result["keep"] for result in results}
+        self.assertEqual(kept, {self.ranked[0]: True, self.ranked[-1]: False})
+        best = self.store.names.index(self.ranked[0])
+        worst = self.store.names.index(self.ranked[-1])
+        # First against drafts without either keeper, then without just the one kept.
+        self.assertIn((6, frozenset({best, worst})), self.engine.pick_values)
+        self.assertIn((6, frozenset({best})), self.engine.pick_values)
+        values = self.engine.round_values(5, 6, frozenset({best}))
+        self.assertEqual([result["round_value"] for result in results], [values[0, 0], values[4, 0]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,182 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+from models import Draft, Roster  # noqa: E402
+from pick_search import PickSearch  # noqa: E402
+from synthetic import generate_projections  # noqa: E402
+from tests.fixtures import synthetic_players  # noqa: E402
+
+
+def parse(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        return 0.0
+
+
+def original_score(row: dict) -> float:
+    """
+    A week's score as the original per-week PlayerStats objects computed it.
+    """
+    return (parse(row["passing_tds"]) * 3 + parse(row["passing_yards"]) / 50 - parse(row["interceptions"]) +
+            parse(row["rushing_tds"]) * 3 + parse(row["rushing_yards"]) / 30 - parse(row["fumbles"]) +
+            parse(row["receiving_tds"]) * 3 + parse(row["receiving_yards"]) / 30)
+
+
+def original_net_additional_score(roster: Roster, player) -> float:
+    """
+    The net additional score as the original implementation computed it, by sorting every week's scores of the
+    roster's players at the position with and without the player. Weeks none of them play count as empty.
+    """
+    if not roster.has_spot(player):
+        return 0.0
+    if roster.has_starting_spot(player):
+        return player.overall_score()
+    starting = roster.starting_positions(player)
+    weekly = {}
+    for teammate in roster.matching_players(player):
+        for week, stats in teammate.stats.items():
+            weekly.setdefault(week, []).append(stats.score())
+    total = 0.0
+    for week, stats in player.stats.items():
+        current = sorted(weekly.get(week, []), reverse=True)[:starting]
+        delta = sum(sorted(current + [stats.score()], reverse=True)[:starting]) - sum(current)
+        if delta > 0.0:
+            total += delta
+    return total
+
+
+class DraftEngineTest(unittest.TestCase):
+    """
+    Checks the columnar store, the starter tables and the pool's lazily maintained rankings against the simple
+    computations they replaced.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.players = synthetic_players(240)
+        cls.by_position = {}
+        for player in cls.players:
+            cls.by_position.setdefault(player.position, []).append(player)
+
+    def test_overall_scores_match_the_original_scoring(self):
+        totals = {}
+        for rows in generate_projections(240).values():
+            for row in rows:
+                totals[row["player_name"]] = totals.get(row["player_name"], 0.0) + original_score(row)
+        for player in self.players:
+            self.assertAlmostEqual(player.overall_score(), totals[player.name], places=9)
+
+    def test_net_additional_scores_match_the_original(self):
+        rng = np.random.default_rng(1)
+        rosters = []
+        for counts in [{"QB": 1, "RB": 2, "WR": 2, "TE": 1}, {"QB": 2, "RB": 3, "WR": 3, "TE": 1},
+                       {"QB": 3, "RB": 5, "WR": 6, "TE": 2}, {"QB": 0, "RB": 10, "WR": 9, "TE": 2}]:
+            roster = Roster()
+            for position, count in counts.items():
+                for idx in rng.choice(len(self.by_position[position]), size=count, replace=False):
+                    roster.add(self.by_position[position][idx])
+            rosters.append(roster)
+        # Every team has a bye and some players miss weeks, so rosters have weeks with fewer starters than spots.
+        self.assertTrue(any(not player.store.played[player.index].all() for player in self.players))
+
+        for roster in rosters:
+            expected = [original_net_additional_score(roster, player) for player in self.players]
+            scores = [roster.net_additional_score(player) for player in self.players]
+            np.testing.assert_allclose(scores, expected, rtol=1e-9, atol=1e-9)
+            np.testing.assert_allclose(roster.net_additional_scores(self.players), expected, rtol=1e-9, atol=1e-9)
+
+    def assertPoolMatchesFullSort(self, draft: Draft) -> None:
+        available = list(draft.pool)
+        for roster in draft.rosters:
+            # The scores are the ones checked against the original above, so ties break exactly as they do in the
+            # pool.
+            nets = roster.net_additional_scores(available).tolist()
+            expected = [player.name for _, player in sorted(
+                zip(nets, available), key=lambda entry: (-entry[0], -entry[1].overall_score(), entry[1].index))]
+            self.assertEqual([player.name for player in draft.pool.ranked(roster)], expected)
+            self.assertEqual([player.name for player in draft.pool.top(roster, 5)], expected[:5])
+            self.assertEqual([player.name for player in draft.pool.top(roster, 3, ["RB"])],
+                             [name for name in expected if draft.pool.find(name).position == "RB"][:3])
+
+    def test_pool_ranking_matches_a_full_sort_through_picks_and_undos(self):
+        rng = np.random.default_rng(2)
+        draft = Draft(4, 0, players=self.players)
+        for step in range(50):
+            if draft.pick_log and rng.random() < 0.3:
+                for _ in range(int(rng.integers(1, min(4, len(draft.pick_log)) + 1))):
+                    draft.undo()
+            else:
+                options = draft.pool.top(draft.current_roster(), 6)
+                draft.pick(options[int(rng.integers(len(options)))])
+            if step % 5 == 4:
+                self.assertPoolMatchesFullSort(draft)
+
+    def test_simulating_the_next_round_leaves_the_draft_as_it_was(self):
+        draft = Draft(4, 1, players=self.players)
+        for _ in range(22):
+            draft.pick(draft.next_best_available())
+        key = draft.board_key()
+        tops = [[player.name for player in draft.pool.top(roster, 10)] for roster in draft.rosters]
+        starters = [roster.best_ball_total() for roster in draft.rosters]
+
+        for _ in range(3):
+            simulated = draft.simulate_to_next_round()
+            self.assertEqual(draft.board_key(), key)
+            self.assertEqual([[player.name for player in draft.pool.top(roster, 10)] for roster in draft.rosters],
+                             tops)
+            self.assertEqual([roster.best_ball_total() for roster in draft.rosters], starters)
+
+        # A draft built from scratch with the same picks, and so none of the cached rankings, picks the same players.
+        fresh = Draft(4, 1, players=self.players)
+        for slot, player, _ in draft.pick_log:
+            fresh.current_position = slot
+            fresh.pick(player)
+        for _ in range(4):
+            fresh.pick(fresh.next_best_available())
+        self.assertEqual([player.name for player in simulated], [player.name for _, player, _ in fresh.pick_log[-4:]])
+        self.assertPoolMatchesFullSort(draft)
+
+    def test_pick_search_matches_a_search_without_transpositions(self):
+        draft = Draft(4, 2, players=self.players)
+        for _ in range(10):
+            draft.pick(draft.next_best_available())
+        key = draft.board_key()
+        search = PickSearch(draft, width=3)
+        result = search.search(max_depth=3, time_budget=60.0)
+        self.assertEqual(draft.board_key(), key)
+        self.assertEqual(result.depth, 3)
+        self.assertIn((key, 3), search.transpositions)
+
+        uncached = PickSearch(draft, width=3)
+        uncached.transpositions = type("Forgetful", (dict,), {"__setitem__": lambda self, key, value: None})()
+        expected = uncached.search(max_depth=3, time_budget=60.0)
+        self.assertEqual((result.player, result.projected_total), (expected.player, expected.projected_total))
+
+
+class NameLookupTest(unittest.TestCase):
+
+    def test_lookups_follow_picks_and_undos_without_rebuilding_the_index(self):
+        players = synthetic_players(120, seed=3)
+        draft = Draft(4, 0, players=players)
+        index = draft.pool.index_names()
+        drafted = draft.next_best_available()
+        draft.pick(drafted)
+        self.assertNotIn(drafted.name, [player.name for player, _ in draft.pool.search(drafted.name)])
+        self.assertNotIn(drafted.name, [player.name for player in draft.pool.complete(drafted.name)])
+
+        draft.undo()
+        self.assertIs(draft.pool.index_names(), index)
+        self.assertEqual(draft.pool.search(drafted.name)[0], (drafted, 1.0))
+        self.assertIn(drafted, draft.pool.complete(drafted.name.split(" ")[-1], limit=len(players)))
+        # Another draft from the same store looks names up in the same index.
+        self.assertIs(Draft(4, 0, players=players).pool.index_names(), index)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+import contextlib
+import io
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from monte_carlo import MonteCarloResult  # noqa: E402
+from player_store import PlayerStore  # noqa: E402
+
+
+class MonteCarloResultTest(unittest.TestCase):
+
+    def setUp(self):
+        names = ["Always There", "Always Gone", "Sometimes There"]
+        self.store = PlayerStore(names, ["RB"] * 3, ["KC"] * 3, ["1"],
+                                 np.zeros((3, 1, len(PlayerStore.STAT_CATEGORIES))), np.ones((3, 1), dtype=bool))
+        self.result = MonteCarloResult(self.store, [5], np.array([[1.0, 0.0, 0.5]]), [0, 1, 2],
+                                       np.array([300.0, 0.0, 140.0]), np.array([2.0, 0.0, 1.0]), 3, 1.0)
+
+    def test_candidates_never_available_have_no_expected_total(self):
+        self.assertEqual(self.result.expected_totals(), {"Always There": 150.0, "Sometimes There": 140.0})
+
+    def test_summary_skips_candidates_never_available(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.result.print_summary()
+        candidates = output.getvalue().split("Probability Available:")[0]
+        self.assertIn("Always There", candidates)
+        self.assertIn("Sometimes There", candidates)
+        self.assertNotIn("Always Gone", candidates)
+        self.assertNotIn("nan", candidates)
+
+
+if __name__ == "__main__":
+    unittest.main()
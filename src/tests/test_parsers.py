@@ -0,0 +1,95 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "services"))
+from parsers import SoupParser, StreamingParser  # noqa: E402
+from synthetic import generate_projections, render_projection_page, write_season_pages  # noqa: E402
+
+PROJECTION_ROW = ('<tr><td><a class="playerName" href="/p">{name}</a> <em>{em}</em></td>{receptions}'
+                  '<td class="stat stat_5">250</td><td class="stat stat_6">2</td><td class="stat stat_7">1</td>'
+                  '<td class="stat stat_14">10</td><td class="stat stat_15">-</td><td class="stat stat_21">-</td>'
+                  '<td class="stat stat_22">-</td><td class="stat stat_30">0.1</td></tr>')
+
+BOX_SCORE_ROW = ('<tr><th data-stat="player"{csv}><a href="/players/x.htm">{name}</a></th>'
+                 '<td data-stat="team">KC</td><td data-stat="pass_yds">12</td><td data-stat="pass_td">0</td>'
+                 '<td data-stat="pass_int">0</td><td data-stat="rush_yds">87</td><td data-stat="rush_td">1</td>'
+                 '{receptions}<td data-stat="rec_yds">40</td><td data-stat="rec_td">0</td>'
+                 '<td data-stat="fumbles_lost">1</td></tr>')
+
+
+class ParserEquivalenceTest(unittest.TestCase):
+    """
+    The streaming parser stands in for the soup parser everywhere, so both must yield the same rows for any page.
+    """
+
+    def assertParsersAgree(self, method: str, text: str) -> list:
+        soup_output = list(getattr(SoupParser(), method)(text))
+        streaming_output = list(getattr(StreamingParser(), method)(text))
+        self.assertEqual(soup_output, streaming_output)
+        return soup_output
+
+    def test_generated_projection_pages(self):
+        for week, rows in generate_projections(60, weeks=3).items():
+            parsed = self.assertParsersAgree("projection_rows", render_projection_page(rows))
+            self.assertEqual([row["player_name"] for row in parsed], [row["player_name"] for row in rows])
+            # The synthetic projections have no receptions column.
+            self.assertEqual({row["receptions"] for row in parsed}, {"-"})
+
+    def test_generated_box_score_and_schedule_pages(self):
+        with tempfile.TemporaryDirectory() as directory:
+            games = write_season_pages(directory, 2023, players=120, weeks=2)
+            with open(os.path.join(directory, "years", "2023", "games.htm"), 'r') as schedule_file:
+                schedule = schedule_file.read()
+            self.assertEqual(len(self.assertParsersAgree("box_score_links", schedule)), games)
+            parsed_games = self.assertParsersAgree("box_score_games", schedule)
+            self.assertEqual({game["week"] for game in parsed_games}, {"1", "2"})
+            for game in parsed_games[:4]:
+                with open(os.path.join(directory, game["link"].lstrip("/")), 'r') as page_file:
+                    self.assertTrue(self.assertParsersAgree("box_score_rows", page_file.read()))
+
+    def test_projection_edge_cases(self):
+        page = ('<html><body><table><tbody>' +
+                PROJECTION_ROW.format(name="With Team", em="QB - KC",
+                                      receptions='<td class="stat stat_20">4.5</td>') +
+                PROJECTION_ROW.format(name="Free Agent", em="WR", receptions="") +
+                PROJECTION_ROW.format(name="Tom &amp; Jerry", em="DEF - NYJ", receptions="") +
+                '</tbody></table></body></html>')
+        parsed = self.assertParsersAgree("projection_rows", page)
+        self.assertEqual([(row["player_name"], row["player_position"], row["player_team"], row["receptions"])
+                          for row in parsed],
+                         [("With Team", "QB", "KC", "4.5"), ("Free Agent", "WR", "N/A", "-"),
+                          ("Tom & Jerry", "DEF", "NYJ", "-")])
+
+    def test_box_score_edge_cases(self):
+        page = ('<html><body><table id="player_offense"><thead><tr><th data-stat="player">Player</th></tr></thead>'
+                '<tbody>' +
+                BOX_SCORE_ROW.format(csv=' data-append-csv="a"', name="Has Receptions",
+                                     receptions='<td data-stat="rec">3</td>') +
+                '<tr class="thead"><th data-stat="player">Player</th><td data-stat="team">Tm</td></tr>' +
+                BOX_SCORE_ROW.format(csv=' data-append-csv="b"', name="No Receptions", receptions="") +
+                BOX_SCORE_ROW.format(csv="", name="No Csv", receptions="") +
+                '</tbody></table></body></html>')
+        parsed = self.assertParsersAgree("box_score_rows", page)
+        self.assertEqual([(row["name"], row["receptions"]) for row in parsed],
+                         [("Has Receptions", 3), ("No Receptions", 0)])
+
+    def test_schedule_with_and_without_weeks(self):
+        page = ('<html><body><table><tbody>'
+                '<tr><th data-stat="week_num">1</th><td data-stat="boxscore_word"><a href="/b/1.htm">box</a></td></tr>'
+                '<tr><td data-stat="boxscore_word"><a href="/b/2.htm">box</a></td>'
+                '<td data-stat="week_num">2</td></tr>'
+                '<tr><td data-stat="boxscore_word"><a href="/b/3.htm">box</a></td></tr>'
+                '</tbody></table><div><td data-stat="boxscore_word"><a href="/b/4.htm">box</a></td></div>'
+                '</body></html>')
+        self.assertParsersAgree("box_score_links", page)
+        parsed = self.assertParsersAgree("box_score_games", page)
+        self.assertEqual([(game["link"], game["week"]) for game in parsed],
+                         [("/b/1.htm", "1"), ("/b/2.htm", "2"), ("/b/3.htm", None), ("/b/4.htm", None)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from models import Draft  # noqa: E402
+from pick_journal import PickJournal  # noqa: E402
+from tests.fixtures import synthetic_players  # noqa: E402
+
+
+class PickJournalTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.filename = os.path.join(self.directory.name, "picks.journal")
+        self.snapshot_filename = os.path.join(self.directory.name, "picks.snapshot.json")
+
+    def journal(self) -> PickJournal:
+        return PickJournal(self.filename, self.snapshot_filename)
+
+    def test_replays_picks_and_undos(self):
+        journal = self.journal()
+        journal.append(1, 0, "A")
+        journal.append(2, 1, "B")
+        journal.undo(2)
+        journal.append(2, 1, "C")
+        journal.append(3, 2, "D")
+        journal.undo(3)
+        journal.undo(2)
+        journal.append(2, 1, "E")
+        replayed = self.journal()
+        self.assertEqual(replayed.picks(), [(0, "A"), (1, "E")])
+        self.assertEqual(replayed.records, 8)
+
+    def test_crash_between_snapshot_and_truncation_replays_exactly(self):
+        journal = self.journal()
+        for pick, player_name in enumerate(["A", "B", "C"], start=1):
+            journal.append(pick, pick - 1, player_name)
+        journal.compact([(0, "A"), (1, "B"), (2, "C")])
+        journal.append(4, 3, "D")
+        journal.undo(4)
+        journal.append(4, 3, "E")
+        journal.append(5, 4, "F")
+        with open(self.filename, 'r') as journal_file:
+            records = journal_file.read()
+
+        # The snapshot of every pick is in place but the crash left the journal it replaces untruncated.
+        journal.compact([(0, "A"), (1, "B"), (2, "C"), (3, "E"), (4, "F")])
+        with open(self.filename, 'w') as journal_file:
+            journal_file.write(records)
+        self.assertEqual(self.journal().picks(), [(0, "A"), (1, "B"), (2, "C"), (3, "E"), (4, "F")])
+
+    def test_torn_last_line_is_cut_before_appending(self):
+        journal = self.journal()
+        journal.append(1, 0, "A")
+        journal.append(2, 1, "B")
+        with open(self.filename, 'a') as journal_file:
+            journal_file.write('{"pick": 3, "slot"')
+
+        journal = self.journal()
+        self.assertEqual(journal.picks(), [(0, "A"), (1, "B")])
+        journal.append(3, 2, "C")
+        self.assertEqual(self.journal().picks(), [(0, "A"), (1, "B"), (2, "C")])
+        with open(self.filename, 'r') as journal_file:
+            self.assertEqual([json.loads(line)["pick"] for line in journal_file], [1, 2, 3])
+
+    def test_bad_line_before_the_last_is_an_error(self):
+        journal = self.journal()
+        journal.append(1, 0, "A")
+        with open(self.filename, 'a') as journal_file:
+            journal_file.write('{"pick": 2, "slot"\n{"pick": 3, "slot": 2, "player": "C"}\n')
+        with self.assertRaises(ValueError):
+            self.journal().picks()
+
+
+class JournaledDraftTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.players = synthetic_players(120)
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def draft(self) -> Draft:
+        return Draft(4, 0, players=self.players, journal=PickJournal(
+            os.path.join(self.directory.name, "picks.journal"),
+            os.path.join(self.directory.name, "picks.snapshot.json")))
+
+    def test_restarted_draft_resumes_where_it_was_left(self):
+        draft = self.draft()
+        for pick in range(1, PickJournal.COMPACT_EVERY + 12):
+            draft.select_next_best_available()
+            if pick % 7 == 0:
+                draft.unselect_player()
+            draft.save()
+        expected = [(slot, player.name) for slot, player, _ in draft.pick_log]
+
+        resumed = self.draft()
+        self.assertEqual([(slot, player.name) for slot, player, _ in resumed.pick_log], expected)
+        self.assertEqual(resumed.current_position, draft.current_position)
+        self.assertEqual(resumed.board_key(), draft.board_key())
+
+    def test_draft_without_a_journal_writes_nothing(self):
+        draft = Draft(4, 0, players=self.players)
+        draft.select_next_best_available()
+        draft.save()
+        self.assertIsNone(draft.journal)
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from player_store import PlayerStore  # noqa: E402
+
+
+def make_store(names: list[str], yards: float) -> PlayerStore:
+    stats = np.zeros((len(names), 2, len(PlayerStore.STAT_CATEGORIES)))
+    stats[:, :, PlayerStore.STAT_CATEGORIES.index("rushing_yards")] = yards
+    return PlayerStore(names, ["RB"] * len(names), ["KC"] * len(names), ["1", "2"], stats,
+                       np.ones((len(names), 2), dtype=bool))
+
+
+class BundleCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, "players.bundle")
+
+    def test_reopening_the_same_bundle_shares_one_store(self):
+        make_store(["A", "B"], 30.0).save(self.path)
+        self.assertIs(PlayerStore.from_bundle(self.path), PlayerStore.from_bundle(self.path))
+        weights = [2 * weight for weight in PlayerStore.SCORING_WEIGHTS]
+        self.assertIs(PlayerStore.reopen(self.path, weights), PlayerStore.reopen(self.path, weights))
+
+    def test_rewritten_bundle_is_opened_again(self):
+        make_store(["A", "B"], 30.0).save(self.path)
+        PlayerStore.from_bundle(self.path)
+        weights = [2 * weight for weight in PlayerStore.SCORING_WEIGHTS]
+        PlayerStore.reopen(self.path, weights)
+
+        make_store(["C", "D", "E"], 60.0).save(self.path)
+        store = PlayerStore.from_bundle(self.path)
+        self.assertEqual(store.names, ["C", "D", "E"])
+        np.testing.assert_allclose(store.totals, [4.0, 4.0, 4.0])
+        rescored = PlayerStore.reopen(self.path, weights)
+        self.assertEqual(rescored.names, ["C", "D", "E"])
+        np.testing.assert_allclose(rescored.totals, [8.0, 8.0, 8.0])
+
+    def test_rewritten_snapshot_is_opened_again(self):
+        snapshot_path = os.path.join(self.directory.name, "snapshots", "key.bundle")
+        os.makedirs(os.path.dirname(snapshot_path))
+        make_store(["A"], 30.0).save_snapshot(snapshot_path)
+        self.assertEqual(PlayerStore.from_bundle(snapshot_path).names, ["A"])
+
+        os.rename(snapshot_path, snapshot_path + ".old")
+        make_store(["B"], 30.0).save_snapshot(snapshot_path)
+        self.assertEqual(PlayerStore.from_bundle(snapshot_path).names, ["B"])
+
+
+if __name__ == "__main__":
+    unittest.main()